@@ -164,6 +164,7 @@ class Chord:
             self._bass = None
             
         self._notes = self._generate_notes()
+        self._note_names = [note.name for note in self._notes]
 
     @property
     def root(self) -> Note:
@@ -200,7 +201,7 @@ class Chord:
     @property
     def note_names(self) -> List[str]:
         """Get note names in the chord."""
-        return [note.name for note in self._notes]
+        return self._note_names.copy()
 
     @property
     def semitones(self) -> List[int]:
@@ -332,6 +332,11 @@ class GuitarFretboard:
                 pos = FretboardPosition(string, fret, self.tuning)
                 self._positions[(string, fret)] = pos
 
+        # Positions grouped by chroma (0-11), in (string, fret) order
+        self._by_chroma: List[List[FretboardPosition]] = [[] for _ in range(12)]
+        for (string, fret), pos in self._positions.items():
+            self._by_chroma[pos.note.chroma].append(pos)
+
     def get_position(self, string: int, fret: int) -> FretboardPosition:
         """Get the position at the specified string and fret."""
         return self._positions[(string, fret)]
@@ -348,19 +353,27 @@ class GuitarFretboard:
             List of positions where the note can be found
         """
         max_fret = max_fret or self.num_frets
-        positions = []
 
-        # Use chroma (chromatic index 0-11) for comparison instead of semitone/midi
-        target_chroma = note.chroma
+        # Compare chroma (chromatic index), not semitone/MIDI
+        return [pos for pos in self._by_chroma[note.chroma] if pos.fret <= max_fret]
 
-        for string in range(1, 7):
-            for fret in range(max_fret + 1):
-                pos = self.get_position(string, fret)
-                # Compare chroma (chromatic index), not semitone/MIDI
-                if pos.note.chroma == target_chroma:
-                    positions.append(pos)
+    def find_positions_batch(self, notes: List[Note], max_fret: Optional[int] = None) -> Dict[str, List[FretboardPosition]]:
+        """
+        Find the positions of several notes with a single lookup per note.
 
-        return positions
+        Args:
+            notes: The notes to find
+            max_fret: Maximum fret to search (default: all frets)
+
+        Returns:
+            Dictionary mapping each note name to its positions
+        """
+        max_fret = max_fret or self.num_frets
+        by_chroma = self._by_chroma
+        return {
+            note.name: [pos for pos in by_chroma[note.chroma] if pos.fret <= max_fret]
+            for note in notes
+        }
 
     def get_scale_positions(self, scale_notes: List[Note], max_fret: int = 12) -> Dict[Note, List[FretboardPosition]]:
         """
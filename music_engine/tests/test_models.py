@@ -13,6 +13,7 @@ from models.note import Note
 from models.chord import Chord
 from models.scale import Scale
 from models.arpeggio import Arpeggio
+from models.fretboard import GuitarFretboard
 from music_engine.exceptions import InvalidNoteError, InvalidScaleError
 
 
@@ -159,3 +160,71 @@ class TestArpeggio:
         # Should be: C, E, G, G, E, C
         expected = ['C4', 'E4', 'G4', 'G4', 'E4', 'C4']
         assert notes == expected
+
+
+def _scan_note_positions(fretboard, note, max_fret):
+    """Reference lookup: scan every string and fret, as find_note_positions used to."""
+    return [
+        (string, fret)
+        for string in range(1, 7)
+        for fret in range(max_fret + 1)
+        if fretboard.get_position(string, fret).note.chroma == note.chroma
+    ]
+
+
+class TestGuitarFretboard:
+    """Test GuitarFretboard position lookups."""
+
+    NOTE_NAMES = ['C', 'C#', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb', 'B']
+
+    def test_find_note_positions_known_values(self):
+        """Test positions of a few notes in standard tuning."""
+        fretboard = GuitarFretboard()
+        e_positions = fretboard.find_note_positions(Note('E'), 5)
+        assert [(p.string, p.fret) for p in e_positions] == [(1, 0), (2, 5), (4, 2), (6, 0)]
+        f_sharp_positions = fretboard.find_note_positions(Note('F#'), 4)
+        assert [(p.string, p.fret) for p in f_sharp_positions] == [(1, 2), (4, 4), (6, 2)]
+
+    @pytest.mark.parametrize('max_fret', [1, 5, 12, 24])
+    def test_find_note_positions_matches_full_scan(self, max_fret):
+        """Test that the chroma table gives the same positions, in the same order, as a scan."""
+        fretboard = GuitarFretboard()
+        for name in self.NOTE_NAMES:
+            note = Note(name)
+            positions = fretboard.find_note_positions(note, max_fret)
+            assert [(p.string, p.fret) for p in positions] == \
+                _scan_note_positions(fretboard, note, max_fret)
+
+    def test_find_note_positions_alternate_tuning(self):
+        """Test lookups on a drop D fretboard with fewer frets."""
+        tuning = [('D', 2), ('A', 2), ('D', 3), ('G', 3), ('B', 3), ('E', 4)]
+        fretboard = GuitarFretboard(num_frets=15, tuning=tuning)
+        for name in self.NOTE_NAMES:
+            note = Note(name)
+            positions = fretboard.find_note_positions(note)
+            assert [(p.string, p.fret) for p in positions] == \
+                _scan_note_positions(fretboard, note, 15)
+
+    def test_find_note_positions_defaults_to_all_frets(self):
+        """Test that omitting max_fret searches the whole neck."""
+        fretboard = GuitarFretboard()
+        note = Note('A')
+        assert fretboard.find_note_positions(note) == fretboard.find_note_positions(note, 24)
+
+    def test_find_positions_batch(self):
+        """Test that the batch lookup matches one find_note_positions call per note."""
+        fretboard = GuitarFretboard()
+        notes = Chord('C', 'dom7').notes
+        batch = fretboard.find_positions_batch(notes, max_fret=12)
+        assert list(batch) == [n.name for n in notes]
+        for note in notes:
+            assert batch[note.name] == fretboard.find_note_positions(note, 12)
+
+    def test_find_positions_batch_keys(self):
+        """Test batch results are keyed by note name."""
+        fretboard = GuitarFretboard()
+        batch = fretboard.find_positions_batch([Note('C'), Note('Eb')], max_fret=3)
+        assert {name: [(p.string, p.fret) for p in ps] for name, ps in batch.items()} == {
+            'C4': [(2, 1), (5, 3)],
+            'Eb4': [(4, 1)],
+        }
@@ -0,0 +1,518 @@
+"""
+Tests for the web app API endpoints and the app-level request hooks.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import web_app.app as web
+from web_app.app import app
+
+
+@pytest.fixture
+def client():
+    # Every test starts with empty per-client rate limits and response cache
+    web._BUCKETS.clear()
+    web._RESPONSE_CACHE.clear()
+    return app.test_client()
+
+
+class TestChordPositionsBatch:
+    """POST /api/chords/positions/batch."""
+
+    def test_batch_matches_single_requests(self, client):
+        r = client.post('/api/chords/positions/batch',
+                        json={'chords': 'C:maj,A:min', 'mode': 'theoretical'})
+        assert r.status_code == 200
+        results = r.get_json()['results']
+        for result, (root, quality) in zip(results, [('C', 'maj'), ('A', 'min')]):
+            single = client.get(f'/api/chords/positions?root={root}&quality={quality}'
+                                f'&mode=theoretical').get_json()
+            assert result == single
+
+    def test_invalid_chord_is_reported_per_item(self, client):
+        r = client.post('/api/chords/positions/batch',
+                        json={'chords': [{'root': 'C'}, {'root': 'H', 'quality': 'maj'}]})
+        assert r.status_code == 200
+        results = r.get_json()['results']
+        assert results[0]['success'] is True
+        assert results[1]['success'] is False
+
+    def test_empty_batch_is_rejected(self, client):
+        r = client.post('/api/chords/positions/batch', json={'chords': []})
+        assert r.status_code == 400
+
+    def test_batch_size_is_capped(self, client):
+        chords = [{'root': 'C', 'quality': 'maj'}] * 33
+        r = client.post('/api/chords/positions/batch', json={'chords': chords})
+        assert r.status_code == 400
+        assert r.get_json()['success'] is False
+
+    @pytest.mark.parametrize('max_fret', [-1, 25, 1000])
+    def test_max_fret_outside_fretboard_is_rejected(self, client, max_fret):
+        r = client.post('/api/chords/positions/batch',
+                        json={'chords': [{'root': 'C', 'max_fret': max_fret}]})
+        assert r.status_code == 400
+
+    def test_default_max_fret_outside_fretboard_is_rejected(self, client):
+        r = client.post('/api/chords/positions/batch',
+                        json={'chords': 'C:maj', 'max_fret': 99})
+        assert r.status_code == 400
+
+
+class TestChordETags:
+    """Conditional GETs on the chords endpoints."""
+
+    def test_matching_etag_gets_304(self, client):
+        r = client.get('/api/chords?root=C&quality=maj')
+        etag = r.headers['ETag']
+        again = client.get('/api/chords?root=C&quality=maj', headers={'If-None-Match': etag})
+        assert again.status_code == 304
+        assert again.headers['ETag'] == etag
+
+    def test_etag_salt_covers_the_engine_source(self, tmp_path, monkeypatch):
+        import shutil
+        import music_engine
+        from api import chords  # the module instance app.py registered
+
+        engine_dir = os.path.dirname(music_engine.__file__)
+        copy = tmp_path / 'music_engine'
+        shutil.copytree(engine_dir, copy, ignore=shutil.ignore_patterns('__pycache__', 'tests'))
+        monkeypatch.setattr(music_engine, '__file__', str(copy / '__init__.py'))
+
+        before = chords._source_digest()
+        model = copy / 'models' / 'chord.py'
+        model.write_text(model.read_text() + '\n# changed\n')
+        assert chords._source_digest() != before
+
+
+class TestPrecompressedResponses:
+    """Static JSON bodies served gzipped only to clients that accept gzip."""
+
+    URLS = ['/api/circle', '/api/orchestrator/genre/progressions?genre=jazz']
+
+    @pytest.mark.parametrize('url', URLS)
+    def test_gzip_when_accepted(self, client, url):
+        import gzip
+        plain = client.get(url)
+        r = client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+        assert r.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(r.data) == plain.data
+        assert 'Accept-Encoding' in r.headers['Vary']
+
+    @pytest.mark.parametrize('url', URLS)
+    @pytest.mark.parametrize('accept', ['', 'identity', 'gzip;q=0', 'br, gzip;q=0'])
+    def test_identity_when_gzip_refused(self, client, url, accept):
+        r = client.get(url, headers={'Accept-Encoding': accept})
+        assert r.status_code == 200
+        assert 'Content-Encoding' not in r.headers
+        assert r.get_json()['success'] is True
+
+
+class TestStaticPages:
+    """HTML pages rendered and compressed once at startup."""
+
+    def test_missing_minifier_is_logged(self, monkeypatch, caplog):
+        monkeypatch.setattr(web, 'htmlmin', None)
+        with caplog.at_level('WARNING'):
+            pages = web._render_pages()
+        assert 'unminified' in caplog.text
+        assert pages['/'][None][0]
+
+
+class TestChordStringParsing:
+    """Root/quality splitting shared by the progressions and orchestrator APIs."""
+
+    @pytest.mark.parametrize('chord, expected', [
+        ('C', ('C', '')),
+        ('Cmaj7', ('C', 'maj7')),
+        ('F#m', ('F#', 'm')),
+        ('Bb7', ('Bb', '7')),
+        (' Ebm7\n', ('Eb', 'm7')),
+        ('', None),
+        ('   ', None),
+        ('H7', None),
+        ('cmaj', None),
+    ])
+    def test_split_root(self, chord, expected):
+        from api.utils import split_root
+        assert split_root(chord) == expected
+
+    @pytest.mark.parametrize('chord, expected', [
+        ('C', ('C', 'maj')),
+        ('F#m7', ('F#', 'm7')),
+        (' Bb9 ', ('Bb', '9')),
+        ('X7', None),
+    ])
+    def test_parse_chord_symbol(self, chord, expected):
+        from api.utils import parse_chord_symbol
+        assert parse_chord_symbol(chord) == expected
+
+    @pytest.mark.parametrize('symbol, name', [
+        ('Cm7', 'CMinor 7th'),
+        ('C7', 'CDominant 7th'),
+        ('C9', 'C9th'),
+        ('F13', 'F13th'),
+        ('Cdim7', 'CDiminished 7th'),
+        ('Cmaj', 'CMajor'),
+    ])
+    def test_symbols_normalize_the_same_on_every_endpoint(self, client, symbol, name):
+        created = client.post('/api/progressions', json={'chords': [symbol]}).get_json()
+        assert created['progression']['chords'] == [name]
+        roman = client.get('/api/progressions/roman', query_string={'key': 'C', 'chords': symbol})
+        assert roman.get_json()['chords'] == [name[:-5] if name.endswith(('Major', 'Minor')) else name]
+        expanded = client.post('/api/orchestrator/expand',
+                               json={'chords': [symbol, 'G'], 'target_length': 3}).get_json()
+        assert expanded['expansions']
+        assert all(name in e for e in expanded['expansions'])
+
+    def test_rootless_chord_is_rejected_on_create(self, client):
+        r = client.post('/api/progressions', json={'chords': ['C', 'X7']})
+        assert r.status_code == 400
+        assert r.get_json()['error'] == 'Invalid chord: X7'
+
+    @pytest.mark.parametrize('value', [None, 1, ['C']])
+    def test_split_root_rejects_non_strings(self, value):
+        from api.utils import split_root
+        with pytest.raises(TypeError):
+            split_root(value)
+
+    @pytest.mark.parametrize('chord', ['F#m', 'Bb', 'Ebm7', 'C#7'])
+    def test_orchestrator_parses_accidental_roots(self, client, chord):
+        r = client.get('/api/orchestrator/next-chords', query_string={'chord': chord})
+        assert r.status_code == 200
+        assert r.get_json()['success'] is True
+
+    def test_orchestrator_expand_keeps_accidental_chords(self, client):
+        r = client.post('/api/orchestrator/expand',
+                        json={'chords': ['Bb', 'Ebm7', ' F#m '], 'target_length': 4})
+        data = r.get_json()
+        assert data['success'] is True
+        for expansion in data['expansions']:
+            assert {'BbMajor', 'EbMinor 7th', 'F#Minor'} <= set(expansion)
+
+    def test_progression_rejects_non_string_chords(self, client):
+        r = client.post('/api/progressions', json={'chords': ['C', None]})
+        assert r.status_code == 400
+        assert r.get_json()['success'] is False
+
+
+class TestCircleKeys:
+    """Key lookups on the circle of fifths, including sharp minor keys."""
+
+    @pytest.mark.parametrize('root', ['F#m', 'C#m', 'G#m', 'D#m', 'A#m'])
+    def test_sharp_minor_key_info(self, client, root):
+        r = client.get('/api/circle/key/' + root.replace('#', '%23'))
+        assert r.status_code == 200
+        key = r.get_json()['key']
+        assert key == {**key, 'root': root, 'type': 'minor'}
+
+    def test_key_lookup_ignores_case(self, client):
+        lower = client.get('/api/circle/key/f%23M').get_json()
+        assert lower == client.get('/api/circle/key/F%23m').get_json()
+
+    def test_sharp_minor_neighbors(self, client):
+        r = client.get('/api/circle/neighbors/C%23m')
+        assert r.status_code == 200
+        assert r.get_json()['neighbors'] == {'counter_clockwise': 'F#m', 'clockwise': 'G#m'}
+
+    def test_sharp_minor_relationships(self, client):
+        r = client.get('/api/circle/relationships/G%23m')
+        assert r.status_code == 200
+        assert r.get_json()['type'] == 'minor'
+
+    def test_unknown_key_is_404(self, client):
+        assert client.get('/api/circle/key/Xm').status_code == 404
+
+
+class TestResponseCache:
+    """In-process cache of deterministic GET responses (app.py)."""
+
+    def test_repeat_get_is_served_from_cache(self, client, monkeypatch):
+        first = client.get('/api/scales?root=D')
+        assert first.status_code == 200
+        assert len(web._RESPONSE_CACHE) == 1
+
+        # A cache hit must not reach the view
+        def fail(*args, **kwargs):
+            raise AssertionError('view called on a cache hit')
+        endpoint = web.app.url_map.bind('').match('/api/scales')[0]
+        monkeypatch.setitem(web.app.view_functions, endpoint, fail)
+        second = client.get('/api/scales?root=D')
+        assert second.status_code == 200
+        assert second.data == first.data
+        assert second.headers['ETag'] == first.headers['ETag']
+
+    def test_cached_response_supports_304(self, client):
+        etag = client.get('/api/scales?root=D').headers['ETag']
+        r = client.get('/api/scales?root=D', headers={'If-None-Match': etag})
+        assert r.status_code == 304
+        assert r.headers['Cache-Control'] == web._API_CACHE_CONTROL
+
+    def test_encodings_are_cached_separately(self, client):
+        plain = client.get('/api/circle')
+        gzipped = client.get('/api/circle', headers={'Accept-Encoding': 'gzip'})
+        assert gzipped.headers['Content-Encoding'] == 'gzip'
+        again = client.get('/api/circle')
+        assert 'Content-Encoding' not in again.headers
+        assert again.data == plain.data
+
+    def test_only_listed_blueprints_are_cached(self, client):
+        client.get('/api/chords?root=C&quality=maj')
+        client.post('/api/progressions', json={'chords': ['C', 'F', 'G']})
+        assert len(web._RESPONSE_CACHE) == 0
+
+
+class TestRateLimit:
+    """Per-client token bucket on the API blueprints."""
+
+    URL = '/api/midi/status'
+
+    def test_requests_beyond_the_burst_get_429(self, client):
+        codes = [client.get(self.URL).status_code for _ in range(web._RATE_LIMIT)]
+        assert set(codes) == {200}
+        r = client.get(self.URL)
+        assert r.status_code == 429
+        assert int(r.headers['Retry-After']) >= 1
+        assert r.get_json() == {'success': False, 'error': 'Too many requests'}
+
+    def test_buckets_are_per_client(self, client):
+        for _ in range(web._RATE_LIMIT + 1):
+            client.get(self.URL)
+        other = client.get(self.URL, environ_base={'REMOTE_ADDR': '10.0.0.2'})
+        assert other.status_code == 200
+
+    def test_forwarded_for_is_ignored_without_a_trusted_proxy(self, client):
+        for i in range(web._RATE_LIMIT):
+            client.get(self.URL, headers={'X-Forwarded-For': f'10.0.2.{i}'})
+        r = client.get(self.URL, headers={'X-Forwarded-For': '10.0.3.1'})
+        assert r.status_code == 429
+
+    def test_tokens_refill_over_time(self, client, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(web.time, 'monotonic', lambda: now[0])
+        for _ in range(web._RATE_LIMIT):
+            client.get(self.URL)
+        assert client.get(self.URL).status_code == 429
+        now[0] += 1 / web._RATE_PER_SECOND
+        assert client.get(self.URL).status_code == 200
+
+    def test_response_cache_hits_are_not_limited(self, client):
+        for _ in range(web._RATE_LIMIT + 1):
+            r = client.get('/api/circle')
+        assert r.status_code == 200
+
+    @pytest.mark.parametrize('path', ['/api/progressions/analyze', '/api/progressions/roman'])
+    def test_cache_misses_are_limited(self, client, path):
+        # A new query string each time: every request misses the response cache
+        codes = [client.get(f'{path}?key=C&chords=C&chords=G&n={i}').status_code
+                 for i in range(web._RATE_LIMIT + 1)]
+        assert codes[-1] == 429
+        assert set(codes[:-1]) == {200}
+
+    def test_posts_are_limited(self, client):
+        body = {'chords': ['C', 'G'], 'key': 'C'}
+        for _ in range(web._RATE_LIMIT):
+            client.post('/api/progressions', json=body)
+        assert client.post('/api/progressions', json=body).status_code == 429
+
+    def test_bucket_table_is_bounded(self, client, monkeypatch):
+        monkeypatch.setattr(web, '_MAX_BUCKETS', 3)
+        for i in range(5):
+            client.get(self.URL, environ_base={'REMOTE_ADDR': f'10.0.1.{i}'})
+        assert [addr for addr, _ in web._BUCKETS] == ['10.0.1.2', '10.0.1.3', '10.0.1.4']
+
+
+class TestCORS:
+    """CORS headers and preflight handling."""
+
+    def test_simple_response_allows_any_origin(self, client):
+        r = client.get('/api/scales?root=C', headers={'Origin': 'https://example.com'})
+        assert r.headers['Access-Control-Allow-Origin'] == '*'
+
+    def test_cached_response_has_single_cors_header(self, client):
+        client.get('/api/scales?root=C')
+        r = client.get('/api/scales?root=C')
+        assert r.headers.getlist('Access-Control-Allow-Origin') == ['*']
+
+    @pytest.mark.parametrize('requested', [
+        'Content-Type',
+        'Content-Type, Authorization',
+        'X-Requested-With',
+    ])
+    def test_preflight_allows_requested_headers(self, client, requested):
+        r = client.options('/api/analysis/chord', headers={
+            'Origin': 'https://example.com',
+            'Access-Control-Request-Method': 'POST',
+            'Access-Control-Request-Headers': requested,
+        })
+        assert r.status_code == 204
+        assert r.headers['Access-Control-Allow-Origin'] == '*'
+        assert r.headers['Access-Control-Allow-Headers'] == requested
+        assert 'POST' in r.headers['Access-Control-Allow-Methods']
+        assert r.headers['Access-Control-Max-Age'] == '86400'
+
+    def test_preflight_is_not_rate_limited(self, client):
+        for _ in range(web._RATE_LIMIT + 1):
+            r = client.options('/api/midi/status', headers={
+                'Origin': 'https://example.com', 'Access-Control-Request-Method': 'GET',
+            })
+        assert r.status_code == 204
+
+    def test_plain_options_is_not_a_preflight(self, client):
+        r = client.options('/api/scales')
+        assert r.status_code == 200
+        assert 'GET' in r.headers['Allow']
+
+
+class TestStaticAssetVersions:
+    """Content-hash ?v= on static URLs and the immutable cache header."""
+
+    def _versioned_url(self, client):
+        import re
+        page = client.get('/').get_data(as_text=True)
+        return re.search(r'/static/css/style\.css\?v=[0-9a-f]{12}', page).group(0)
+
+    def test_pages_link_versioned_assets(self, client):
+        url = self._versioned_url(client)
+        assert url.endswith('?v=' + web._STATIC_VERSIONS['css/style.css'])
+
+    def test_matching_version_is_immutable(self, client):
+        r = client.get(self._versioned_url(client))
+        assert r.status_code == 200
+        assert r.headers.getlist('Cache-Control') == [web._STATIC_IMMUTABLE]
+
+    @pytest.mark.parametrize('query', ['', '?v=000000000000'])
+    def test_unversioned_or_stale_url_keeps_short_max_age(self, client, query):
+        r = client.get('/static/css/style.css' + query)
+        assert r.status_code == 200
+        assert 'immutable' not in r.headers['Cache-Control']
+
+    def test_middleware_overrides_the_inner_server(self):
+        # Stands in for WhiteNoise, which serves /static/ itself and ignores ?v=
+        def inner(environ, start_response):
+            start_response('200 OK', [('Cache-Control', 'max-age=3600, public')])
+            return [b'body']
+
+        captured = {}
+
+        def start_response(status, headers, exc_info=None):
+            captured['headers'] = headers
+
+        middleware = web.ImmutableStaticAssets(inner, '/static/', {'js/main.js': 'abc'})
+        middleware({'PATH_INFO': '/static/js/main.js', 'QUERY_STRING': 'v=abc'}, start_response)
+        assert captured['headers'] == [('Cache-Control', web._STATIC_IMMUTABLE)]
+        middleware({'PATH_INFO': '/static/js/main.js', 'QUERY_STRING': 'v=old'}, start_response)
+        assert captured['headers'] == [('Cache-Control', 'max-age=3600, public')]
+
+
+class TestChordQualitiesList:
+    """GET /api/chords/list."""
+
+    def test_list_is_cacheable_but_revalidated(self, client):
+        r = client.get('/api/chords/list')
+        assert r.status_code == 200
+        assert 'immutable' not in r.headers['Cache-Control']
+        again = client.get('/api/chords/list', headers={'If-None-Match': r.headers['ETag']})
+        assert again.status_code == 304
+
+
+class TestMidiExport:
+    """Bytes produced by the MIDI export endpoints (checked with mido when written)."""
+
+    HEADER = '4d546864000000060000000101e0'  # MThd, format 0, 1 track, 480 ticks/beat
+
+    CMAJ7_CHORD = (
+        HEADER + '4d54726b0000002c'
+        '00ff510307a120'                          # tempo 120 bpm
+        '00903c40' '00904040' '00904340' '00904740'  # C4 E4 G4 B4 on together
+        '8360803c00' '00804000' '00804300' '00804700'  # off after 480 ticks (VLQ 83 60)
+        '00ff2f00'
+    )
+
+    D_MAJOR_SCALE = (
+        HEADER + '4d54726b0000004a'
+        '00ff510307a120'
+        # each note: on, then off after 240 ticks (VLQ 81 70)
+        + ''.join(f'0090{n:02x}40' f'817080{n:02x}00' for n in (62, 64, 66, 67, 69, 71, 73))
+        + '00ff2f00'
+    )
+
+    PROGRESSION = (
+        HEADER + '4d54726b00000038'
+        '00ff51030a2c2a'                          # tempo 90 bpm
+        + ''.join(f'0090{n:02x}40' f'817080{n:02x}00' for n in (60, 57, 65, 68, 58))
+        + '00ff2f00'
+    )
+
+    def test_chord_export_bytes(self, client):
+        r = client.get('/api/midi/export/chord?root=C&quality=maj7')
+        assert r.status_code == 200
+        assert r.mimetype == 'audio/midi'
+        assert r.data.hex() == self.CMAJ7_CHORD
+
+    def test_scale_export_bytes(self, client):
+        r = client.get('/api/midi/export/scale?root=D&type=major')
+        assert r.status_code == 200
+        assert r.data.hex() == self.D_MAJOR_SCALE
+
+    def test_progression_bytes(self):
+        from api.midi import _create_midi_fallback
+        notes = ['C4', 'A3', 'F', 'G#4', 'Bb3', 'H2', 'Am', 7]  # the last three are skipped
+        assert _create_midi_fallback(notes, tempo=90).hex() == self.PROGRESSION
+
+    @pytest.mark.parametrize('n, encoded', [
+        (0, '00'), (127, '7f'), (128, '8100'), (240, '8170'), (480, '8360'), (16384, '818000'),
+    ])
+    def test_variable_length_quantity(self, n, encoded):
+        from api.midi import _vlq
+        assert _vlq(n).hex() == encoded
+
+
+class TestOrchestratorRequestBody:
+    """JSON bodies of the orchestrator POST routes."""
+
+    def test_chunked_body_is_read(self, client):
+        import io
+        body = b'{"chords": ["Dm7", "G7", "Cmaj7"], "num_chords": 2}'
+        r = client.post('/api/orchestrator/continuation',
+                        input_stream=io.BytesIO(body),
+                        content_type='application/json',
+                        headers={'Transfer-Encoding': 'chunked'},
+                        environ_base={'wsgi.input_terminated': True})
+        assert r.status_code == 200
+        assert r.get_json()['success'] is True
+
+    @pytest.mark.parametrize('body', [b'', b'not json', b'[1, 2]'])
+    def test_missing_or_invalid_body_is_400(self, client, body):
+        r = client.post('/api/orchestrator/suggest', data=body, content_type='application/json')
+        assert r.status_code == 400
+        assert r.get_json()['success'] is False
+
+
+class TestProgressionAnalysis:
+    """GET /api/progressions/analyze and /roman."""
+
+    def test_unparseable_chords_are_skipped(self, client):
+        r = client.get('/api/progressions/analyze?chords=C&chords=xyz&chords=G7&chords=Cbogus')
+        assert r.status_code == 200
+        assert r.get_json()['analysis']['chords'] == ['C', 'GDominant 7th']
+
+    def test_no_parseable_chord_is_400(self, client):
+        r = client.get('/api/progressions/roman?key=C&chords=xyz&chords=H7')
+        assert r.status_code == 400
+        assert r.get_json()['error'] == 'Could not parse any valid chords'
+
+    def test_engine_type_errors_are_not_swallowed(self, client, monkeypatch):
+        from api import progressions
+
+        def broken(root, quality):
+            raise TypeError('bug')
+        monkeypatch.setattr(progressions, '_chord', broken)
+        progressions._parse_one.cache_clear()
+        with pytest.raises(TypeError):
+            progressions._parse_chord_list(['C'])
+        progressions._parse_one.cache_clear()
@@ -2,13 +2,23 @@
 API Blueprint Exports
 
 This module exports all API blueprints for the web application.
+Submodules are imported on first attribute access (PEP 562), so importing
+one blueprint (``from api.scales import bp``) doesn't load all the others.
 """
 
-from . import scales
-from . import chords
-from . import progressions
-from . import analysis
-from . import analyzer
+import importlib
 
-__all__ = ['scales', 'chords', 'progressions', 'analysis', 'analyzer']
+__all__ = ['scales', 'chords', 'progressions', 'analysis', 'analyzer',
+           'circle', 'midi', 'orchestrator']
 
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f'{__name__}.{name}')
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
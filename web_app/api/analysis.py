@@ -2,9 +2,6 @@
 Analysis API Blueprint
 REST API endpoints for music analysis.
 """
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from flask import Blueprint, jsonify, request
 
@@ -4,10 +4,6 @@ Analyzer API Blueprint
 Unified API endpoint for analyzing chords and scales.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from flask import Blueprint, jsonify, request
 from music_engine.core.harmony import HarmonyEngine
 from music_engine.models import Chord, Scale
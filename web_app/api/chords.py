@@ -2,23 +2,146 @@
 Chords API Blueprint - Versione migliorata con modalità realistic/theoretical
 REST API endpoints per operazioni sugli accordi.
 """
-import sys
+import hashlib
+import logging
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from flask import Blueprint, jsonify, request
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from urllib.parse import unquote_plus, urlencode
+
+import music_engine
+import orjson
+from flask import Blueprint, Response, g, request
+from music_engine.core.harmony import HarmonyEngine
 from music_engine.models import Chord
+from music_engine.models.chord import CHORD_INTERVALS, CHORD_NAMES
+from .utils import CACHE_LONG
+
+# Backend audio per /play, importato una volta sola: senza librerie audio
+# l'import può fallire anche con errori diversi da ImportError
+try:
+    from music_engine.utils.audio import play_chord as _engine_play_chord
+    _AUDIO_ERROR = None
+except Exception as e:
+    _engine_play_chord = None
+    _AUDIO_ERROR = str(e)
 
 bp = Blueprint('chords', __name__, url_prefix='/api/chords')
 
+logger = logging.getLogger(__name__)
+
+# HarmonyEngine è senza stato mutabile (solo la tabella del manico):
+# un'unica istanza condivisa evita di ricostruire il fretboard a ogni richiesta
+_ENGINE = HarmonyEngine()
+
+# Cache-Control per le risposte GET: CACHE_LONG (condiviso con gli altri
+# blueprint) per gli endpoint che sono funzioni pure dei parametri, CACHE_SHORT
+# per il resto
+CACHE_SHORT = 'public, max-age=600'
+
+# Pool condiviso per pre-calcolare in background la modalità non richiesta;
+# _WARMED è condiviso tra i thread del worker, quindi sempre sotto _WARMED_LOCK
+_POOL = ThreadPoolExecutor(max_workers=4)
+_WARMED = set()
+_WARMED_LOCK = threading.Lock()
+DEFAULT_MAX_FRET = 12
+
+# Limiti di /positions/batch: ogni accordo non in cache costa un calcolo completo
+MAX_BATCH_CHORDS = 32
+FRET_RANGE = range(0, 25)
+
 
 # --- Helper Functions ---
 
+def _json_response(obj, status=200, cache_control=None):
+    """Serializza la risposta con orjson (più veloce di jsonify).
+
+    Con cache_control la risposta riceve anche un ETag forte; se il client
+    invia un If-None-Match corrispondente si risponde 304 senza corpo.
+    """
+    payload = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return _bytes_response(payload, status, cache_control)
+
+
+def _etag(payload):
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _source_digest():
+    """Hash del sorgente di questo modulo e del pacchetto music_engine (test esclusi).
+
+    Le risposte dipendono anche dal motore (Chord, Fretboard...): una sua
+    modifica deve cambiare gli ETag anche se chords.py resta uguale.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    engine_dir = os.path.dirname(os.path.abspath(music_engine.__file__))
+    paths = [os.path.abspath(__file__)]
+    for dirpath, dirnames, filenames in os.walk(engine_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in ('tests', '__pycache__'))
+        paths.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith('.py'))
+    for path in paths:
+        h.update(os.path.relpath(path, engine_dir).encode())
+        with open(path, 'rb') as src:
+            h.update(src.read())
+    return h.digest()
+
+
+# L'ETag dei GET dipende dai parametri e dal codice che genera le risposte,
+# così cambia a ogni deploy che tocca chords.py o il motore ma è lo stesso su
+# tutti i worker
+_ETAG_SALT = _source_digest()
+
+
+def _etagged(view):
+    """ETag calcolato dalla query canonica: se il client lo ha già, 304 senza generare la risposta.
+
+    Da usare sugli endpoint che rispondono con CACHE_SHORT.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        query = urlencode(sorted(request.args.items(multi=True)))
+        etag = hashlib.blake2b(f'{request.path}?{query}'.encode(), digest_size=16, key=_ETAG_SALT).hexdigest()
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers={
+                'ETag': f'"{etag}"', 'Cache-Control': CACHE_SHORT, 'Vary': 'Accept-Encoding',
+            })
+        g.etag = etag
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _bytes_response(payload, status=200, cache_control=None, etag=None):
+    """Come _json_response, ma per un corpo JSON già serializzato.
+
+    etag può essere passato già calcolato per i corpi statici.
+    """
+    if cache_control is None or status != 200:
+        return Response(payload, status=status, mimetype='application/json')
+
+    if etag is None:
+        etag = g.get('etag') or _etag(payload)
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+    return Response(payload, status=status, mimetype='application/json', headers=headers)
+
+
+# Nome canonico della qualità (come in CHORD_INTERVALS) per le tabelle di shape:
+# un solo lookup invece di lower()/replace() a ogni chiamata
+_QUALITY_NORM = {}
+for _q in CHORD_INTERVALS:
+    for _variant in (_q, _q.upper(), _q.capitalize()):
+        _QUALITY_NORM.setdefault(_variant, _q)
+_QUALITY_NORM.update({'m': 'min', '7': 'dom7', 'm7': 'min7'})
+
+
 def sanitize_root(root: str) -> str:
     """Pulizia della root note da URL-encoded accidentals."""
     if not root:
-        root = "C"
-    return root.replace('%23', '#').replace('%20', ' ').replace('+', ' ')
+        return "C"
+    # Un solo passaggio in C: decodifica ogni %XX (anche %2B, %25...) e '+' -> spazio
+    return unquote_plus(root)
 
 
 def get_chord_object(root: str, quality: str):
@@ -30,54 +153,92 @@ def get_chord_object(root: str, quality: str):
         return None, str(e)
 
 
-def _suggest_fingers(frets):
-    """Suggerisce dita per i fret (0=open/X, 1=index, 2=middle, 3=ring, 4=pinky)"""
-    def mapping(f):
-        if f is None or f == 0:
-            return 0
-        elif f <= 3:
-            return 1
-        elif f <= 5:
-            return 2
-        elif f <= 8:
-            return 3
-        else:
-            return 4
-    return [mapping(f) for f in frets]
+@lru_cache(maxsize=256)
+def _inversion_note_names(root: str, quality: str):
+    """Nomi delle note di ogni inversione (tuple di tuple), calcolati una volta per (root, quality)."""
+    inversions = Chord(root, quality).get_all_inversions()
+    return tuple(tuple(n.name for n in inv.notes) for inv in inversions)
 
 
-def _build_voicing(chord, inversion, note_positions):
-    """Costruisce un singolo voicing combinando le note sugli 6 strings (theoretical mode)."""
-    chord_notes = chord.notes
-    rotated_notes = chord_notes[inversion:] + chord_notes[:inversion] if inversion else chord_notes
+# Dito suggerito per ogni fret 0..24 (0=open/X, 1=index, 2=middle, 3=ring, 4=pinky)
+_FINGER_TABLE = tuple(0 if f == 0 else 1 if f <= 3 else 2 if f <= 5 else 3 if f <= 8 else 4
+                      for f in range(25))
 
-    frets = [None] * 6
-    used_strings = set()
 
-    for note in rotated_notes:
-        note_name = note.name
-        if note_name not in note_positions:
+def _voicing_fields(frets):
+    """In un solo passaggio sui fret: (notes, fingers, base_fret).
+
+    fingers: 0=open/X, 1=index, 2=middle, 3=ring, 4=pinky.
+    base_fret: primo fret suonato, 1 se nessuno.
+    """
+    notes = []
+    fingers = []
+    base_fret = None
+    for f in frets:
+        if f is None:
+            fingers.append(0)
             continue
-        for pos in note_positions[note_name]:
-            string_num = pos['string']
-            string_idx = 6 - string_num
-            if string_idx not in used_strings:
-                frets[string_idx] = pos['fret']
-                used_strings.add(string_idx)
+        if base_fret is None:
+            base_fret = f
+        notes.append(f)
+        # oltre il 24° tasto il valore resta 4, quindi basta saturare l'indice
+        fingers.append(_FINGER_TABLE[f if f < 24 else 24])
+    return notes, fingers, 1 if base_fret is None else base_fret
+
+
+def _find_note_positions(chord, engine, max_fret=12):
+    """Posizioni sul manico di ogni nota dell'accordo, indicizzate per nome nota.
+
+    Ogni posizione è una tupla (string, fret, midi): orjson la emette come array.
+    """
+    batch = engine.fretboard.find_positions_batch(chord.notes, max_fret=max_fret)
+    return {
+        name: [(p.string, p.fret, p.midi) for p in pos_list]
+        for name, pos_list in batch.items()
+    }
+
+
+def _note_slots(chord, note_positions):
+    """Per ogni nota dell'accordo (in ordine) le tuple (string_idx, bit, fret) delle sue posizioni.
+
+    Calcolate una volta per accordo e condivise da tutte le inversioni.
+    """
+    slots = []
+    for note in chord.notes:
+        positions = note_positions.get(note.name, ())
+        slots.append(tuple((6 - string, 1 << (6 - string), fret) for string, fret, _ in positions))
+    return slots
+
+
+def _build_voicing(inversion, note_slots):
+    """Costruisce un singolo voicing combinando le note sugli 6 strings (theoretical mode)."""
+    rotated = note_slots[inversion:] + note_slots[:inversion] if inversion else note_slots
+
+    frets = [None] * 6
+    used = 0  # bitmask delle corde occupate (bit i = frets[i])
+    count = 0
+
+    for slots in rotated:
+        for string_idx, bit, fret in slots:
+            if not used & bit:
+                frets[string_idx] = fret
+                used |= bit
+                count += 1
                 break
-        if len(used_strings) >= 3:
+        if count >= 3:
             break
 
-    if sum(1 for f in frets if f is not None) < 3:
+    if count < 3:
         return None
 
+    notes, fingers, _ = _voicing_fields(frets)
     inversion_names = ['Root Position', '1st Inversion', '2nd Inversion', '3rd Inversion']
     return {
         'position': inversion,
         'name': inversion_names[inversion] if inversion < len(inversion_names) else f'Inversion {inversion}',
         'frets': frets,
-        'notes': [f for f in frets if f is not None],
-        'fingers': _suggest_fingers(frets),
+        'notes': notes,
+        'fingers': fingers,
     }
 
 
@@ -108,6 +269,8 @@ STANDARD_CHORD_SHAPES = {
     'C_min7': [None, 3, 5, 3, 4, 3],
     'A_min7': [None, 0, 2, 0, 1, 0],
 }
+# Shapes are read-only: freeze them so lookups can hand them out without copying
+STANDARD_CHORD_SHAPES = {k: tuple(v) for k, v in STANDARD_CHORD_SHAPES.items()}
 
 
 # Note to fret mapping for barre chords
@@ -123,17 +286,8 @@ NOTE_TO_FRET_A_SHAPE = {
 
 def _get_chord_shape(root, quality):
     """Get standard chord shape for a chord."""
-    q = quality.lower().replace('maj', 'maj').replace('min', 'min').replace('dom', 'dom').replace('dim', 'dim').replace('aug', 'aug')
-    key = root + '_' + q
-    
-    if key in STANDARD_CHORD_SHAPES:
-        return STANDARD_CHORD_SHAPES[key].copy()
-    
-    for q_var in [q, q.replace('7', '_dom7'), q.replace('maj7', '_maj7'), q.replace('min7', '_min7')]:
-        if root + '_' + q_var in STANDARD_CHORD_SHAPES:
-            return STANDARD_CHORD_SHAPES[root + '_' + q_var].copy()
-    
-    return None
+    q = _QUALITY_NORM.get(quality) or quality.lower()
+    return STANDARD_CHORD_SHAPES.get(root + '_' + q)
 
 
 # CAGED system chord shapes - known correct voicings
@@ -163,7 +317,7 @@ CAGED_SHAPES = {
         'A': {'open': [None, 0, 2, 2, 1, 0], 'A_barre': [None, 0, 2, 2, 1, 0]},
         'B': {'open': [None, 2, 4, 4, 3, 2], 'A_barre': [None, 2, 4, 4, 3, 2]},
     },
-    '7': {
+    'dom7': {
         # Dominant 7th chords - using correct CAGED voicings
         'C': {'open': [None, 3, 2, 3, 1, 0], 'A_barre': [None, 3, 5, 3, 5, 3]},
         'D': {'open': [None, None, 0, 2, 1, 2], 'A_barre': [None, None, 0, 2, 1, 2]},
@@ -210,6 +364,11 @@ CAGED_SHAPES = {
         'A#': {'open': [None, 1, 3, 1, 2, 1], 'A_barre': [None, 1, 3, 1, 2, 1]},
     },
 }
+# Freeze the fret lists as tuples (see STANDARD_CHORD_SHAPES)
+CAGED_SHAPES = {
+    q: {r: {s: tuple(f) for s, f in shapes.items()} for r, shapes in roots.items()}
+    for q, roots in CAGED_SHAPES.items()
+}
 
 # Map any root to the closest CAGED shape using the fret number
 ROOT_TO_BASE = {
@@ -238,83 +397,154 @@ REFERENCE_BARRE_ROOTS = {
     'D#': 11, # Eb/D# at 11th fret
 }
 
-def _get_caged_shape(root, quality, shape_type, max_fret=12):
-    """Get CAGED shape for chord - with transposing for all 12 roots."""
-    root_upper = root.upper()
-    
-    # Handle enharmonics
-    enharmonic_map = {
-        'C#': 'C#', 'DB': 'C#',
-        'D#': 'D#', 'EB': 'D#',
-        'F#': 'F#', 'GB': 'F#',
-        'G#': 'G#', 'AB': 'G#',
-        'A#': 'A#', 'BB': 'A#',
-    }
-    
-    original_root = root_upper
-    if root_upper in enharmonic_map:
-        root_upper = enharmonic_map[root_upper]
-    
-    # Map common notations
-    quality_map = {
-        'maj': 'maj', 
-        'min': 'min', 
-        'm': 'min',
-        '7': '7',
-        'dom7': '7',
-        'maj7': 'maj7',
-        'min7': 'min7',
-        'm7': 'min7',
-    }
-    q = quality_map.get(quality, quality)
-    
+# Enharmonic normalization (upper-case root -> CAGED_SHAPES key), identity for naturals/sharps
+_ROOT_NORMALIZE = {
+    'C': 'C', 'D': 'D', 'E': 'E', 'F': 'F', 'G': 'G', 'A': 'A', 'B': 'B',
+    'C#': 'C#', 'DB': 'C#',
+    'D#': 'D#', 'EB': 'D#',
+    'F#': 'F#', 'GB': 'F#',
+    'G#': 'G#', 'AB': 'G#',
+    'A#': 'A#', 'BB': 'A#',
+}
+
+def _caged_candidates(q, root_upper, original_root, shape_type):
+    """Candidate CAGED frets in priority order, each paired with its highest fret.
+
+    Direct match first, then the A-shape barre transposed from each
+    reference root; _get_caged_shape returns the first one within max_fret.
+    """
+    shapes = CAGED_SHAPES.get(q)
+    if shapes is None:
+        return ()
+
+    candidates = []
     # First try: direct match in CAGED_SHAPES
-    if q in CAGED_SHAPES and root_upper in CAGED_SHAPES[q]:
-        if shape_type in CAGED_SHAPES[q][root_upper]:
-            frets = CAGED_SHAPES[q][root_upper][shape_type]
-            if all(f is None or f <= max_fret for f in frets):
-                return frets
-    
+    if root_upper in shapes and shape_type in shapes[root_upper]:
+        candidates.append(shapes[root_upper][shape_type])
+
     # Second try: transpose from a reference root
     # Use E-shape barre as reference (it's at the lowest fret for E)
     if shape_type == 'A_barre':
         # Get target fret position for this root
         target_fret = REFERENCE_BARRE_ROOTS.get(root_upper, REFERENCE_BARRE_ROOTS.get(original_root, 0))
-        
+
         # Try transposing from each available reference
         for ref_root in ['E', 'A', 'C', 'D', 'F', 'G']:
-            if q in CAGED_SHAPES and ref_root in CAGED_SHAPES[q]:
-                if 'A_barre' in CAGED_SHAPES[q][ref_root]:
-                    ref_frets = CAGED_SHAPES[q][ref_root]['A_barre']
-                    ref_fret = REFERENCE_BARRE_ROOTS.get(ref_root, 0)
-                    fret_shift = target_fret - ref_fret
-                    if fret_shift >= 0:
-                        transposed = [f + fret_shift if f is not None else None for f in ref_frets]
-                        if all(f is None or f <= max_fret for f in transposed):
-                            return transposed
+            if ref_root in shapes and 'A_barre' in shapes[ref_root]:
+                ref_frets = shapes[ref_root]['A_barre']
+                fret_shift = target_fret - REFERENCE_BARRE_ROOTS.get(ref_root, 0)
+                if fret_shift >= 0:
+                    candidates.append(tuple(f + fret_shift if f is not None else None for f in ref_frets))
+
+    return tuple((frets, max((f for f in frets if f is not None), default=0)) for frets in candidates)
+
+
+def _expand_caged():
+    """Precompute the candidates for every (quality, root, shape_type) at import."""
+    expanded = {}
+    for q in CAGED_SHAPES:
+        for root_upper in REFERENCE_BARRE_ROOTS:
+            for shape_type in ('open', 'A_barre'):
+                expanded[(q, root_upper, shape_type)] = _caged_candidates(q, root_upper, root_upper, shape_type)
+    return expanded
+
+
+_EXPANDED_CAGED = _expand_caged()
+
+
+@lru_cache(maxsize=2048)
+def _get_caged_shape(root, quality, shape_type, max_fret=12):
+    """Get CAGED shape for chord - with transposing for all 12 roots.
+
+    Cached: the returned frets are a shared tuple, never mutate them.
+    """
+    original_root = root.upper()
+    # Handle enharmonics: single table lookup, no branches
+    root_upper = _ROOT_NORMALIZE.get(original_root, original_root)
     
+    q = _QUALITY_NORM.get(quality, quality)
+
+    candidates = _EXPANDED_CAGED.get((q, root_upper, shape_type))
+    if candidates is None:
+        # Root outside the 12 precomputed names: build the candidates on the fly
+        candidates = _caged_candidates(q, root_upper, original_root, shape_type)
+
+    for frets, top_fret in candidates:
+        if top_fret <= max_fret:
+            return frets
     return None
 
 
-def _generate_realistic_voicings(chord, max_fret=12):
-    """Generate voicings using REAL guitar chord shapes (CAGED-based)."""
+def _static_voicing(name, frets, position=0):
+    """Costruisce un voicing statico (non-barre, base_fret 1), con campi immutabili."""
+    frets = tuple(frets)
+    notes, fingers, _ = _voicing_fields(frets)
+    return {
+        'position': position,
+        'name': name,
+        'frets': frets,
+        'notes': tuple(notes),
+        'fingers': tuple(fingers),
+        'is_barre': False,
+        'base_fret': 1,
+    }
+
+
+# Movable triad shapes, built once at import (read-only, never mutate)
+# position 0=root, 1=1st inv, 2=2nd inv per allineare diagrammi alle inversioni
+# Root position: bass=root (C-E-G)
+# 1st inversion: bass=3rd (E-G-C for maj, G-B-D for min)
+# 2nd inversion: bass=5th (G-C-E for maj, D-F-A for min)
+_TRIAD_VOICINGS = (
+    _static_voicing('Triad (D-shape)', [None, None, 0, 2, 3, 2]),
+    _static_voicing('Triad (A-shape)', [None, 0, 2, 2, 1, 0]),
+    _static_voicing('Triad (E-shape)', [0, 2, 2, 1, 0, 0]),
+    # 1st inversion: bass=3rd of chord (E-G-C for Cmaj) - E on low E open, G on D 3, C on B 1
+    _static_voicing('Triad (1st inv)', [0, None, 3, 1, None, None], position=1),
+    # 2nd inversion: bass=5th (G-C-E for Cmaj) - G on D open, C on G 1, E on B open
+    _static_voicing('Triad (2nd inv)', [None, None, None, 0, 1, 0], position=2),
+)
+
+# Common movable 7th voicings used as fallback
+_SEVENTH_VOICINGS = (
+    _static_voicing('7th (E-shape)', [0, 2, 0, 1, 0, 0]),
+    _static_voicing('7th (A-shape)', [None, 0, 2, 0, 1, 0]),
+    _static_voicing('7th (D-shape)', [None, None, 0, 2, 1, 2]),
+)
+
+
+# Numero massimo di voicings restituiti per accordo
+_MAX_VOICINGS = 8
+
+
+def _chord_root_name(chord):
+    """Nome della root senza ottava (es. 'C#4' -> 'C#')."""
     root = chord.root.name
     if root[-1].isdigit():
         root = root[:-1]
-    quality = chord.quality
-    
+    return root
+
+
+@lru_cache(maxsize=1024)
+def _generate_realistic_voicings(root, quality, max_fret=12):
+    """Generate voicings using REAL guitar chord shapes (CAGED-based).
+
+    Pure function of (root, quality, max_fret), so it is cached; returns a
+    tuple of shared voicing dicts that callers must not mutate.
+    """
     voicings = []
     root_upper = root.upper()
     
     # Get open chord if available
     standard_shape = _get_chord_shape(root, quality)
     if standard_shape:
+        notes, fingers, _ = _voicing_fields(standard_shape)
         voicings.append({
             'position': 0,
             'name': 'Open Position',
             'frets': standard_shape,
-            'notes': [f for f in standard_shape if f is not None],
-            'fingers': _suggest_fingers(standard_shape),
+            'notes': notes,
+            'fingers': fingers,
             'is_barre': False,
             'base_fret': 1,
         })
@@ -323,44 +553,21 @@ def _generate_realistic_voicings(chord, max_fret=12):
     # A-shape barre
     a_frets = _get_caged_shape(root, quality, 'A_barre', max_fret)
     if a_frets:
-        # Find the first non-None fret for base_fret
-        base_fret = next((f for f in a_frets if f is not None), 1)
+        # base_fret is the first non-None fret
+        notes, fingers, base_fret = _voicing_fields(a_frets)
         voicings.append({
             'position': -1,
             'name': f'Barre A-Shape (fret {base_fret})',
             'frets': a_frets,
-            'notes': [f for f in a_frets if f is not None],
-            'fingers': _suggest_fingers(a_frets),
+            'notes': notes,
+            'fingers': fingers,
             'is_barre': True,
             'base_fret': base_fret,
         })
     
-    # Add triad voicings (movable shapes)
-    # position 0=root, 1=1st inv, 2=2nd inv per allineare diagrammi alle inversioni
+    # Add triad voicings (movable shapes), only as many as still fit
     if quality in ['maj', 'min', 'dim', 'aug']:
-        # Fixed triad voicings with CORRECT inversions:
-        # Root position: bass=root (C-E-G)
-        # 1st inversion: bass=3rd (E-G-C for maj, G-B-D for min)
-        # 2nd inversion: bass=5th (G-C-E for maj, D-F-A for min)
-        triad_voicings = [
-            {'name': 'Triad (D-shape)', 'frets': [None, None, 0, 2, 3, 2], 'position': 0},
-            {'name': 'Triad (A-shape)', 'frets': [None, 0, 2, 2, 1, 0], 'position': 0},
-            {'name': 'Triad (E-shape)', 'frets': [0, 2, 2, 1, 0, 0], 'position': 0},
-            # 1st inversion: bass=3rd of chord (E-G-C for Cmaj) - E on low E open, G on D 3, C on B 1
-            {'name': 'Triad (1st inv)', 'frets': [0, None, 3, 1, None, None], 'position': 1},
-            # 2nd inversion: bass=5th (G-C-E for Cmaj) - G on D open, C on G 1, E on B open
-            {'name': 'Triad (2nd inv)', 'frets': [None, None, None, 0, 1, 0], 'position': 2},
-        ]
-        for tv in triad_voicings:
-            voicings.append({
-                'position': tv['position'],
-                'name': tv['name'],
-                'frets': tv['frets'],
-                'notes': [f for f in tv['frets'] if f is not None],
-                'fingers': _suggest_fingers(tv['frets']),
-                'is_barre': False,
-                'base_fret': 1,
-            })
+        voicings.extend(_TRIAD_VOICINGS[:_MAX_VOICINGS - len(voicings)])
     
     # Add seventh chord voicings using CAGED shapes
     seventh_qualities = ['7', 'dom7', 'maj7', 'min7', 'm7']
@@ -368,90 +575,80 @@ def _generate_realistic_voicings(chord, max_fret=12):
         # First try CAGED shapes for 7th chords
         seventh_frets = _get_caged_shape(root, quality, 'A_barre', max_fret)
         if seventh_frets:
-            base_fret = next((f for f in seventh_frets if f is not None), 1)
+            notes, fingers, base_fret = _voicing_fields(seventh_frets)
             voicings.append({
                 'position': -1,
                 'name': f'A-Barren (fret {base_fret})',
                 'frets': seventh_frets,
-                'notes': [f for f in seventh_frets if f is not None],
-                'fingers': _suggest_fingers(seventh_frets),
+                'notes': notes,
+                'fingers': fingers,
                 'is_barre': True,
                 'base_fret': base_fret,
             })
         
         # Also try open shape if available
         open_frets = _get_caged_shape(root, quality, 'open', max_fret)
-        if open_frets:
+        if open_frets and len(voicings) < _MAX_VOICINGS:
+            notes, fingers, _ = _voicing_fields(open_frets)
             voicings.append({
                 'position': 0,
                 'name': 'Open Position',
                 'frets': open_frets,
-                'notes': [f for f in open_frets if f is not None],
-                'fingers': _suggest_fingers(open_frets),
+                'notes': notes,
+                'fingers': fingers,
                 'is_barre': False,
                 'base_fret': 1,
             })
         
         # Add common movable 7th voicings as fallback
-        seventh_voicings = [
-            {'name': '7th (E-shape)', 'frets': [0, 2, 0, 1, 0, 0]},
-            {'name': '7th (A-shape)', 'frets': [None, 0, 2, 0, 1, 0]},
-            {'name': '7th (D-shape)', 'frets': [None, None, 0, 2, 1, 2]},
-        ]
-        for sv in seventh_voicings:
-            voicings.append({
-                'position': 0,
-                'name': sv['name'],
-                'frets': sv['frets'],
-                'notes': [f for f in sv['frets'] if f is not None],
-                'fingers': _suggest_fingers(sv['frets']),
-                'is_barre': False,
-                'base_fret': 1,
-            })
+        voicings.extend(_SEVENTH_VOICINGS[:_MAX_VOICINGS - len(voicings)])
     
-    return voicings[:8]
+    return tuple(voicings)
 
 
-def _generate_theoretical_voicings(chord, engine, max_fret=12):
-    """Generate voicings using THEORETICAL algorithm (all possible combinations)."""
-    root = chord.root.name
-    if root[-1].isdigit():
-        root = root[:-1]
+def _generate_theoretical_voicings(chord, engine, max_fret=12, note_positions=None):
+    """Generate voicings using THEORETICAL algorithm (all possible combinations).
+
+    Returns (voicings, note_positions) so callers can reuse the fretboard search.
+    """
+    root = _chord_root_name(chord)
     quality = chord.quality
     
     voicings = []
+    seen = set()  # frets già inseriti: dedup O(1) invece di confrontare i dict
     
     standard_shape = _get_chord_shape(root, quality)
     
     if standard_shape:
+        seen.add(tuple(standard_shape))
+        notes, fingers, _ = _voicing_fields(standard_shape)
         voicings.append({
             'position': 0,
             'name': 'Standard Shape',
             'frets': standard_shape,
-            'notes': [f for f in standard_shape if f is not None],
-            'fingers': _suggest_fingers(standard_shape),
+            'notes': notes,
+            'fingers': fingers,
             'is_barre': False,
             'base_fret': 1,
         })
     
-    note_positions = {}
-    for note in chord.notes:
-        pos_list = engine.fretboard.find_note_positions(note, max_fret=max_fret)
-        note_positions[note.name] = [{'string': p.string, 'fret': p.fret, 'midi': p.midi} for p in pos_list]
-
-    root_voicing = _build_voicing(chord, 0, note_positions)
-    if root_voicing and root_voicing not in voicings:
-        root_voicing['is_barre'] = False
-        root_voicing['base_fret'] = 1
-        voicings.append(root_voicing)
-
-    inversions = chord.get_all_inversions()
-    for i, _ in enumerate(inversions[1:], 1):
-        inv_voicing = _build_voicing(chord, i, note_positions)
-        if inv_voicing and inv_voicing not in voicings:
-            inv_voicing['is_barre'] = False
-            inv_voicing['base_fret'] = 1
-            voicings.append(inv_voicing)
+    if note_positions is None:
+        note_positions = _find_note_positions(chord, engine, max_fret)
+
+    note_slots = _note_slots(chord, note_positions)
+    for i in range(len(note_slots)):
+        if len(voicings) >= _MAX_VOICINGS:
+            return voicings, note_positions
+        inv_voicing = _build_voicing(i, note_slots)
+        if inv_voicing is None:
+            continue
+        key = tuple(inv_voicing['frets'])
+        if key in seen:
+            continue
+        seen.add(key)
+        inv_voicing['is_barre'] = False
+        inv_voicing['base_fret'] = 1
+        voicings.append(inv_voicing)
 
     barre_shapes = [
         {'name': 'Barre E-Shape', 'base_fret': 5, 'root_string': 5},
@@ -459,93 +656,187 @@ def _generate_theoretical_voicings(chord, engine, max_fret=12):
     ]
     
     for shape in barre_shapes:
+        if len(voicings) >= _MAX_VOICINGS:
+            break
         frets = [None] * 6
         base_fret = shape['base_fret']
         if base_fret <= max_fret:
             for i in range(shape['root_string'], 6):
                 if frets[i] is None:
                     frets[i] = base_fret + (5 - i)
-            
+
+            key = tuple(frets)
+            if key in seen:
+                continue
+            seen.add(key)
+            notes, fingers, _ = _voicing_fields(frets)
             voicings.append({
                 'position': -1,
                 'name': shape['name'],
                 'frets': frets,
-                'notes': [f for f in frets if f is not None],
-                'fingers': _suggest_fingers(frets),
+                'notes': notes,
+                'fingers': fingers,
                 'is_barre': True,
                 'base_fret': base_fret,
             })
 
-    return voicings[:8]
+    return voicings, note_positions
 
 
 def _generate_practical_voicings(chord, engine, max_fret=12, mode='realistic'):
-    """Generate voicings based on mode: 'realistic' or 'theoretical'."""
+    """Generate voicings based on mode: 'realistic' or 'theoretical'.
+
+    Returns (voicings, note_positions); note_positions is None when the mode
+    did not need to search the fretboard.
+    """
     if mode == 'theoretical':
         return _generate_theoretical_voicings(chord, engine, max_fret)
     else:
-        return _generate_realistic_voicings(chord, max_fret)
+        return _generate_realistic_voicings(_chord_root_name(chord), chord.quality, max_fret), None
+
+
+@lru_cache(maxsize=512)
+def _chord_summary(root, quality):
+    """Blocco 'chord' della risposta: dipende solo da (root, quality), non da max_fret/mode.
+
+    Il dict è condiviso: non modificarlo.
+    """
+    chord = Chord(root, quality)
+    return {
+        'name': chord.name,
+        'root': chord.root.name,
+        'quality': chord.quality,
+        'notes': tuple(chord.note_names),
+    }
+
+
+@lru_cache(maxsize=1024)
+def _compute_positions_payload(root, quality, max_fret, mode):
+    """Payload completo di /positions; restituisce (payload, error).
+
+    Il risultato è condiviso tra le richieste: trattarlo in sola lettura.
+    """
+    chord, error = get_chord_object(root, quality)
+    if error:
+        return None, error
+
+    engine = _ENGINE
+    voicings, positions = _generate_practical_voicings(chord, engine, max_fret, mode)
+    if positions is None:
+        positions = _find_note_positions(chord, engine, max_fret)
+
+    return {
+        'success': True,
+        'mode': mode,
+        'chord': _chord_summary(root, quality),
+        'note_positions': positions,
+        'voicings': voicings,
+    }, None
+
+
+def _log_warm_error(future):
+    """Done-callback del pool: un errore nel pre-calcolo finisce nel log invece di perdersi."""
+    error = future.exception()
+    if error is not None:
+        logger.error("Pre-calcolo dei voicings fallito", exc_info=error)
+
+
+def _warm_other_mode(root, quality, max_fret, mode):
+    """Pre-calcola in background l'altra modalità, così la richiesta successiva è una cache hit.
+
+    Solo per il max_fret di default: con valori arbitrari del client il
+    pre-calcolo raddoppierebbe il lavoro senza quasi mai servire.
+    """
+    if max_fret != DEFAULT_MAX_FRET:
+        return
+    other = 'theoretical' if mode == 'realistic' else 'realistic'
+    key = (root, quality, max_fret, other)
+    with _WARMED_LOCK:
+        if key in _WARMED:
+            return
+        if len(_WARMED) >= 4096:  # stesso ordine di grandezza della lru_cache
+            _WARMED.clear()
+        _WARMED.add(key)
+    _POOL.submit(_compute_positions_payload, *key).add_done_callback(_log_warm_error)
+
+
+@bp.record_once
+def _warm_voicing_cache(setup_state):
+    """All'avvio pre-calcola i voicings realistic per le 12 root e le qualità più comuni."""
+    for quality in ('maj', 'min', 'dom7', 'maj7', 'min7'):
+        for root in REFERENCE_BARRE_ROOTS:
+            _generate_realistic_voicings(root, quality, 12)
 
 
 # --- Endpoints ---
 
 @bp.route('', methods=['GET'])
+@_etagged
 def get_chord():
     root = sanitize_root(request.args.get('root'))
     quality = request.args.get('quality', 'maj')
     chord, error = get_chord_object(root, quality)
     if error:
-        return jsonify({'success': False, 'error': error}), 400
+        return _json_response({'success': False, 'error': error}, 400)
 
-    return jsonify({
+    return _json_response({
         'success': True,
         'chord': {
             'root': chord.root.name,
             'quality': chord.quality,
             'name': chord.name,
-            'notes': [n.name for n in chord.notes],
+            'notes': chord.note_names,
             'intervals': chord.intervals,
             'semitones': chord.semitones,
         }
-    })
+    }, cache_control=CACHE_SHORT)
+
+
+# CHORD_INTERVALS è statico: il corpo di /list si serializza una volta sola
+_QUALITIES_JSON_BYTES = orjson.dumps({
+    'success': True,
+    'qualities': [{'id': q, 'name': CHORD_NAMES.get(q, q.upper()), 'intervals': list(i)}
+                  for q, i in CHORD_INTERVALS.items()],
+})
+_QUALITIES_ETAG = _etag(_QUALITIES_JSON_BYTES)
 
 
 @bp.route('/list', methods=['GET'])
 def list_chord_qualities():
-    from music_engine.models.chord import CHORD_INTERVALS, CHORD_NAMES
-    qualities = [{'id': q, 'name': CHORD_NAMES.get(q, q.upper()), 'intervals': i} for q, i in CHORD_INTERVALS.items()]
-    return jsonify({'success': True, 'qualities': qualities})
+    return _bytes_response(_QUALITIES_JSON_BYTES, cache_control=CACHE_LONG, etag=_QUALITIES_ETAG)
 
 
 @bp.route('/inversions', methods=['GET'])
+@_etagged
 def get_inversions():
     root = sanitize_root(request.args.get('root'))
     quality = request.args.get('quality', 'maj')
     chord, error = get_chord_object(root, quality)
     if error:
-        return jsonify({'success': False, 'error': error}), 400
+        return _json_response({'success': False, 'error': error}, 400)
 
     inversions_data = []
-    for i, inv in enumerate(chord.get_all_inversions()):
+    for i, names in enumerate(_inversion_note_names(root, quality)):
         inversions_data.append({
             'position': i,
-            'bass': inv.notes[0].name if inv.notes else root,
-            'notes': [n.name for n in inv.notes],
+            'bass': names[0] if names else root,
+            'notes': list(names),
         })
-    return jsonify({'success': True, 'inversions': inversions_data})
+    return _json_response({'success': True, 'inversions': inversions_data}, cache_control=CACHE_SHORT)
 
 
 @bp.route('/voicing', methods=['GET'])
+@_etagged
 def get_voicing():
     root = sanitize_root(request.args.get('root'))
     quality = request.args.get('quality', 'maj')
     octave = int(request.args.get('octave', 4))
     chord, error = get_chord_object(root, quality)
     if error:
-        return jsonify({'success': False, 'error': error}), 400
+        return _json_response({'success': False, 'error': error}, 400)
 
     voicing_data = [{'note': n.name, 'octave': o} for n, o in chord.get_voicing(octave=octave, spread=True)]
-    return jsonify({'success': True, 'voicing': voicing_data})
+    return _json_response({'success': True, 'voicing': voicing_data}, cache_control=CACHE_SHORT)
 
 
 @bp.route('/play', methods=['POST'])
@@ -557,78 +848,115 @@ def play_chord():
         duration = data.get('duration', 2.0)
         
         if not notes:
-            return jsonify({'success': False, 'error': 'No notes provided'}), 400
+            return _json_response({'success': False, 'error': 'No notes provided'}, 400)
         
-        # Try to play using the music_engine audio system
+        if _engine_play_chord is None:
+            return _json_response({
+                'success': False, 
+                'error': f'Audio not available: {_AUDIO_ERROR}'
+            }, 500)
+
+        # Play using the music_engine audio system
         try:
-            import sys
-            import os
-            sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
-            from music_engine.utils.audio import play_chord as engine_play_chord
-            
             # Convert notes to proper format and play
             # Notes can be like 'C4', 'E4', 'G4'
             play_notes = [str(n) for n in notes]
-            engine_play_chord(play_notes, duration)
+            _engine_play_chord(play_notes, duration)
             
-            return jsonify({
+            return _json_response({
                 'success': True, 
                 'message': f'Playing chord: {" ".join(play_notes)}',
                 'notes': play_notes
             })
-        except ImportError as e:
-            return jsonify({
-                'success': False, 
-                'error': f'Audio not available: {str(e)}'
-            }), 500
         except Exception as e:
-            return jsonify({
+            return _json_response({
                 'success': False, 
                 'error': f'Error playing chord: {str(e)}'
-            }), 500
+            }, 500)
             
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
+        return _json_response({'success': False, 'error': str(e)}, 400)
 
 
 @bp.route('/positions', methods=['GET'])
+@_etagged
 def get_chord_positions():
-    import logging
-    logger = logging.getLogger(__name__)
-    
     root = sanitize_root(request.args.get('root'))
     quality = request.args.get('quality', 'maj')
-    max_fret = int(request.args.get('max_fret', 12))
+    max_fret = int(request.args.get('max_fret', DEFAULT_MAX_FRET))
     mode = request.args.get('mode', 'realistic')
     
-    logger.info(f"[DEBUG] /positions called with root={root}, quality={quality}, mode={mode}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("/positions called with root=%s, quality=%s, mode=%s", root, quality, mode)
     
     if mode not in ['realistic', 'theoretical']:
         mode = 'realistic'
     
-    chord, error = get_chord_object(root, quality)
+    payload, error = _compute_positions_payload(root, quality, max_fret, mode)
     if error:
-        return jsonify({'success': False, 'error': error}), 400
+        return _json_response({'success': False, 'error': error}, 400)
 
-    from music_engine.core.harmony import HarmonyEngine
-    engine = HarmonyEngine()
-    voicings = _generate_practical_voicings(chord, engine, max_fret, mode)
+    _warm_other_mode(root, quality, max_fret, mode)
+    return _json_response(payload, cache_control=CACHE_SHORT)
 
-    positions = {}
-    for note in chord.notes:
-        note_positions = engine.fretboard.find_note_positions(note, max_fret=max_fret)
-        positions[note.name] = [{'string': p.string, 'fret': p.fret, 'midi': p.midi} for p in note_positions]
 
-    return jsonify({
-        'success': True,
-        'mode': mode,
-        'chord': {
-            'name': chord.name,
-            'root': chord.root.name,
-            'quality': chord.quality,
-            'notes': chord.note_names,
-        },
-        'note_positions': positions,
-        'voicings': voicings,
-    })
 
+def _parse_batch_chords(chords):
+    """Accetta una lista di dict oppure la forma compatta 'C:maj,F:maj,G:7'."""
+    if isinstance(chords, str):
+        parsed = []
+        for item in chords.split(','):
+            item = item.strip()
+            if not item:
+                continue
+            root, _, quality = item.partition(':')
+            parsed.append({'root': root, 'quality': quality or 'maj'})
+        return parsed
+    return chords
+
+
+@bp.route('/positions/batch', methods=['POST'])
+def get_chord_positions_batch():
+    """Posizioni per più accordi (es. una progressione) in una sola richiesta.
+
+    Body JSON: {'chords': [{'root', 'quality', 'max_fret', 'mode'}, ...]}
+    oppure {'chords': 'C:maj,F:maj,G:maj'}; 'max_fret' e 'mode' al livello
+    superiore fanno da default per ogni accordo.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        chords = _parse_batch_chords(data.get('chords', []))
+        if not chords:
+            return _json_response({'success': False, 'error': 'No chords provided'}, 400)
+        if len(chords) > MAX_BATCH_CHORDS:
+            return _json_response({
+                'success': False, 'error': f'Too many chords (max {MAX_BATCH_CHORDS})',
+            }, 400)
+
+        default_max_fret = int(data.get('max_fret', DEFAULT_MAX_FRET))
+        default_mode = data.get('mode', 'realistic')
+
+        requested = []
+        for item in chords:
+            max_fret = int(item.get('max_fret', default_max_fret))
+            if max_fret not in FRET_RANGE:
+                return _json_response({
+                    'success': False,
+                    'error': f'max_fret must be between {FRET_RANGE.start} and {FRET_RANGE.stop - 1}',
+                }, 400)
+            requested.append((item, max_fret))
+
+        results = []
+        for item, max_fret in requested:
+            root = sanitize_root(item.get('root'))
+            quality = item.get('quality') or 'maj'
+            mode = item.get('mode', default_mode)
+            if mode not in ['realistic', 'theoretical']:
+                mode = 'realistic'
+
+            payload, error = _compute_positions_payload(root, quality, max_fret, mode)
+            results.append({'success': False, 'error': error} if error else payload)
+
+        return _json_response({'success': True, 'results': results})
+    except Exception as e:
+        return _json_response({'success': False, 'error': str(e)}, 400)
@@ -2,12 +2,14 @@
 Circle of Fifths API Blueprint
 REST API endpoints for circle of fifths operations.
 """
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functools import lru_cache
+from itertools import product
+from typing import NamedTuple
 
-from flask import Blueprint, jsonify, request
+import orjson
+from flask import Blueprint, Response, jsonify, request
 from music_engine.models import Note, Chord, Scale
+from .utils import precompress_json, static_json_response
 
 # Blueprint name
 BLUEPRINT_NAME = 'circle'
@@ -15,40 +17,117 @@ BLUEPRINT_NAME = 'circle'
 bp = Blueprint('circle', __name__, url_prefix='/api/circle')
 
 
+class MajorKey(NamedTuple):
+    """A major key on the circle (serialized with _asdict())."""
+    root: str
+    position: int
+    fifths: int
+    key_signature: int
+    color: str
+
+
+class MinorKey(NamedTuple):
+    """A minor key on the circle (serialized with _asdict())."""
+    root: str
+    relative_major: str
+    position: int
+    color: str
+
+
 # Circle of Fifths data
 # Major keys in order (clockwise): C, G, D, A, E, B, F#/Gb, Db, Ab, Eb, Bb, F
 MAJOR_KEYS = [
-    {'root': 'C', 'position': 0, 'fifths': 0, 'key_signature': 0, 'color': '#74c0fc'},
-    {'root': 'G', 'position': 1, 'fifths': 7, 'key_signature': 1, 'color': '#69db7c'},
-    {'root': 'D', 'position': 2, 'fifths': 14, 'key_signature': 2, 'color': '#ffd43b'},
-    {'root': 'A', 'position': 3, 'fifths': 21, 'key_signature': 3, 'color': '#ff8787'},
-    {'root': 'E', 'position': 4, 'fifths': 28, 'key_signature': 4, 'color': '#da77f2'},
-    {'root': 'B', 'position': 5, 'fifths': 35, 'key_signature': 5, 'color': '#63e6be'},
-    {'root': 'F#', 'position': 6, 'fifths': 42, 'key_signature': 6, 'color': '#4dabf7'},
-    {'root': 'Gb', 'position': 7, 'fifths': -6, 'key_signature': -6, 'color': '#f783ac'},
-    {'root': 'Db', 'position': 8, 'fifths': -12, 'key_signature': -5, 'color': '#f783ac'},
-    {'root': 'Ab', 'position': 9, 'fifths': -18, 'key_signature': -4, 'color': '#a9e34b'},
-    {'root': 'Eb', 'position': 10, 'fifths': -24, 'key_signature': -3, 'color': '#ffc078'},
-    {'root': 'Bb', 'position': 11, 'fifths': -30, 'key_signature': -2, 'color': '#b197fc'},
-    {'root': 'F', 'position': 12, 'fifths': -36, 'key_signature': -1, 'color': '#38d9a9'},
+    MajorKey('C', 0, 0, 0, '#74c0fc'),
+    MajorKey('G', 1, 7, 1, '#69db7c'),
+    MajorKey('D', 2, 14, 2, '#ffd43b'),
+    MajorKey('A', 3, 21, 3, '#ff8787'),
+    MajorKey('E', 4, 28, 4, '#da77f2'),
+    MajorKey('B', 5, 35, 5, '#63e6be'),
+    MajorKey('F#', 6, 42, 6, '#4dabf7'),
+    MajorKey('Gb', 7, -6, -6, '#f783ac'),
+    MajorKey('Db', 8, -12, -5, '#f783ac'),
+    MajorKey('Ab', 9, -18, -4, '#a9e34b'),
+    MajorKey('Eb', 10, -24, -3, '#ffc078'),
+    MajorKey('Bb', 11, -30, -2, '#b197fc'),
+    MajorKey('F', 12, -36, -1, '#38d9a9'),
 ]
 
 # Minor keys (relative minors - 3 semitones below their major)
 MINOR_KEYS = [
-    {'root': 'Am', 'relative_major': 'C', 'position': 0, 'color': '#e599f7'},
-    {'root': 'Em', 'relative_major': 'G', 'position': 1, 'color': '#a5d8ff'},
-    {'root': 'Bm', 'relative_major': 'D', 'position': 2, 'color': '#b2f2bb'},
-    {'root': 'F#m', 'relative_major': 'A', 'position': 3, 'color': '#ffe066'},
-    {'root': 'C#m', 'relative_major': 'E', 'position': 4, 'color': '#ffa8a8'},
-    {'root': 'G#m', 'relative_major': 'B', 'position': 5, 'color': '#d0bfff'},
-    {'root': 'D#m', 'relative_major': 'F#', 'position': 6, 'color': '#7be9ad'},
-    {'root': 'A#m', 'relative_major': 'Gb', 'position': 7, 'color': '#4dabf7'},
-    {'root': 'Fm', 'relative_major': 'Ab', 'position': 8, 'color': '#f783ac'},
-    {'root': 'Cm', 'relative_major': 'Db', 'position': 9, 'color': '#a9e34b'},
-    {'root': 'Gm', 'relative_major': 'Eb', 'position': 10, 'color': '#ffc078'},
-    {'root': 'Dm', 'relative_major': 'F', 'position': 11, 'color': '#b197fc'},
+    MinorKey('Am', 'C', 0, '#e599f7'),
+    MinorKey('Em', 'G', 1, '#a5d8ff'),
+    MinorKey('Bm', 'D', 2, '#b2f2bb'),
+    MinorKey('F#m', 'A', 3, '#ffe066'),
+    MinorKey('C#m', 'E', 4, '#ffa8a8'),
+    MinorKey('G#m', 'B', 5, '#d0bfff'),
+    MinorKey('D#m', 'F#', 6, '#7be9ad'),
+    MinorKey('A#m', 'Gb', 7, '#4dabf7'),
+    MinorKey('Fm', 'Ab', 8, '#f783ac'),
+    MinorKey('Cm', 'Db', 9, '#a9e34b'),
+    MinorKey('Gm', 'Eb', 10, '#ffc078'),
+    MinorKey('Dm', 'F', 11, '#b197fc'),
 ]
 
+# Lookup by root note (without the 'm' for minor keys): root -> (index, key data)
+MAJOR_BY_ROOT = {key.root: (i, key) for i, key in enumerate(MAJOR_KEYS)}
+MINOR_BY_ROOT = {key.root.replace('m', ''): (i, key) for i, key in enumerate(MINOR_KEYS)}
+
+# Every letter-case spelling of the circle keys ('am', 'AM', 'f#M', ...) ->
+# (canonical key name, root note, is_minor)
+_CANON_KEY = {}
+for _key in MAJOR_KEYS + MINOR_KEYS:
+    _name = _key.root
+    _is_minor = _name.endswith('m')
+    for _chars in product(*({c.lower(), c.upper()} for c in _name)):
+        _CANON_KEY[''.join(_chars)] = (_name, _name[:-1] if _is_minor else _name, _is_minor)
+
+
+def _canon_key(root):
+    """(key name, root note, is_minor) for a key given in any letter case."""
+    canon = _CANON_KEY.get(root)
+    if canon is None:
+        # Not on the circle (e.g. 'Bbm', 'Cb'): title-case it as before
+        root = root.title()
+        is_minor = root.endswith('m')
+        canon = (root, root[:-1] if is_minor else root, is_minor)
+    return canon
+
+# Note name of each chromatic index (0-11), as Note.from_semitone spells it
+_SEMITONE_TO_NAME = tuple(Note.from_semitone(i).name for i in range(12))
+
+# Chromatic index (0-11) of every natural, sharp and flat root
+_ROOT_TO_SEMITONE = {
+    letter + accidental: Note(letter + accidental).semitone % 12
+    for letter in 'CDEFGAB' for accidental in ('', '#', 'b')
+}
+
+
+def _semitone(root_note):
+    """Chromatic index (0-11) of a root note name."""
+    semitone = _ROOT_TO_SEMITONE.get(root_note)
+    if semitone is None:
+        # Unusual spelling (e.g. 'Cbb'): let Note parse it, or raise
+        semitone = Note(root_note).semitone % 12
+    return semitone
+
+# Key relationships indexed by the root's chromatic index
+_MAJOR_RELS = tuple(
+    {
+        'relative_minor': _SEMITONE_TO_NAME[(s - 3) % 12] + 'm',  # 3 semitones down
+        'dominant': _SEMITONE_TO_NAME[(s + 7) % 12],  # V chord (perfect 5th)
+        'subdominant': _SEMITONE_TO_NAME[(s + 5) % 12],  # IV chord (perfect 4th)
+    }
+    for s in range(12)
+)
+_MINOR_RELS = tuple(
+    {
+        'relative_major': _SEMITONE_TO_NAME[(s + 3) % 12],  # 3 semitones up
+        'dominant': _SEMITONE_TO_NAME[(s + 7) % 12] + 'm',
+        'subdominant': _SEMITONE_TO_NAME[(s + 5) % 12] + 'm',
+    }
+    for s in range(12)
+)
+
 # Common chord progressions by key
 COMMON_PROGRESSIONS = {
     'major': [
@@ -66,105 +145,127 @@ COMMON_PROGRESSIONS = {
 }
 
 
+# The circle data is static: serialize (and compress) the response body once
+_CIRCLE_BODY, _CIRCLE_BODY_GZ = precompress_json({
+    'success': True,
+    'major_keys': [key._asdict() for key in MAJOR_KEYS],
+    'minor_keys': [key._asdict() for key in MINOR_KEYS],
+})
+
+
 @bp.route('', methods=['GET'])
 def get_circle_of_fifths():
     """Get the complete circle of fifths data."""
-    try:
-        return jsonify({
-            'success': True,
-            'major_keys': MAJOR_KEYS,
-            'minor_keys': MINOR_KEYS,
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
+    return static_json_response(_CIRCLE_BODY, _CIRCLE_BODY_GZ)
+
+
+@lru_cache(maxsize=64)
+def _diatonic_chords(root_note, scale_type):
+    """Diatonic triads of a key; cached and shared between requests (read-only)."""
+    scale = Scale(root_note, scale_type)
+    chords = []
+    
+    # Roman numeral mapping
+    roman_numerals = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII']
+    if scale_type == 'minor_natural':
+        roman_numerals = ['i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii']
+    
+    for degree in range(1, 8):
+        try:
+            triad = scale.get_triad(degree)
+            chords.append({
+                'degree': degree,
+                'roman': roman_numerals[degree - 1],
+                'chord': triad.name,
+                'quality': triad.quality,
+                'notes': tuple(n.name for n in triad.notes),
+            })
+        except Exception as e:
+            pass
+    return tuple(chords)
+
+
+def _key_info(root):
+    """Build the /key/<root> payload for a root from _canon_key: (payload, status)."""
+    # Check if it's a minor key
+    is_minor = root.endswith('m')
+    if is_minor:
+        root_note = root[:-1]  # Remove 'm'
+    else:
+        root_note = root
+        
+    # Find in major or minor keys
+    by_root = MINOR_BY_ROOT if is_minor else MAJOR_BY_ROOT
+    _, key_data = by_root.get(root_note, (None, None))
+    
+    if key_data is None:
+        return {'success': False, 'error': 'Key not found'}, 404
+    
+    # Get diatonic chords for this key
+    scale_type = 'minor_natural' if is_minor else 'major'
+    chords = _diatonic_chords(root_note, scale_type)
+    
+    # Get relative key
+    relative_key = None
+    if not is_minor:
+        # Major -> relative minor (3 semitones down)
+        relative_semitone = (_semitone(root_note) - 3) % 12
+        relative_key = {
+            'key': _SEMITONE_TO_NAME[relative_semitone] + 'm',
+            'type': 'minor'
+        }
+    else:
+        # Minor -> relative major (3 semitones up)
+        relative_semitone = (_semitone(root_note) + 3) % 12
+        relative_key = {
+            'key': _SEMITONE_TO_NAME[relative_semitone],
+            'type': 'major'
+        }
+    
+    # Get common progressions
+    progressions = COMMON_PROGRESSIONS['minor' if is_minor else 'major']
+    
+    return {
+        'success': True,
+        'key': {
+            'root': root,
+            'type': 'minor' if is_minor else 'major',
+            'position': key_data.position,
+            'key_signature': getattr(key_data, 'key_signature', 0),
+        },
+        'relative_key': relative_key,
+        'diatonic_chords': chords,
+        'common_progressions': progressions,
+    }, 200
+
+
+def _precompute_key_info():
+    """Serialized /key/<root> responses for every key on the circle."""
+    bodies = {}
+    for key in MAJOR_KEYS + MINOR_KEYS:
+        root = key.root
+        try:
+            payload, status = _key_info(root)
+        except Exception:
+            continue  # served (and reported) by the request path instead
+        if status == 200:
+            bodies[root] = orjson.dumps(payload)
+    return bodies
+
+
+_KEY_INFO_JSON = _precompute_key_info()
 
 
 @bp.route('/key/<root>', methods=['GET'])
 def get_key_info(root):
     """Get detailed information about a specific key."""
     try:
-        root = root.title()  # Capitalize first letter
-        
-        # Check if it's a minor key
-        is_minor = root.endswith('m')
-        if is_minor:
-            root_note = root[:-1]  # Remove 'm'
-        else:
-            root_note = root
-            
-        # Find in major or minor keys
-        key_data = None
-        if is_minor:
-            for key in MINOR_KEYS:
-                if key['root'].replace('m', '') == root_note:
-                    key_data = key
-                    break
-        else:
-            for key in MAJOR_KEYS:
-                if key['root'] == root_note:
-                    key_data = key
-                    break
-        
-        if not key_data:
-            return jsonify({'success': False, 'error': 'Key not found'}), 404
-        
-        # Get diatonic chords for this key
-        scale_type = 'minor_natural' if is_minor else 'major'
-        scale = Scale(root_note, scale_type)
-        chords = []
-        
-        # Roman numeral mapping
-        roman_numerals = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII']
-        if is_minor:
-            roman_numerals = ['i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii']
-        
-        for degree in range(1, 8):
-            try:
-                triad = scale.get_triad(degree)
-                chords.append({
-                    'degree': degree,
-                    'roman': roman_numerals[degree - 1],
-                    'chord': triad.name,
-                    'quality': triad.quality,
-                    'notes': [n.name for n in triad.notes],
-                })
-            except Exception as e:
-                pass
-        
-        # Get relative key
-        relative_key = None
-        if not is_minor:
-            # Major -> relative minor (3 semitones down)
-            n = Note(root_note)
-            relative_semitone = (n.semitone - 3) % 12
-            relative_key = {
-                'key': Note.from_semitone(relative_semitone).name + 'm',
-                'type': 'minor'
-            }
-        else:
-            # Minor -> relative major (3 semitones up)
-            n = Note(root_note)
-            relative_semitone = (n.semitone + 3) % 12
-            relative_key = {
-                'key': Note.from_semitone(relative_semitone).name,
-                'type': 'major'
-            }
-        
-        # Get common progressions
-        progressions = COMMON_PROGRESSIONS['minor' if is_minor else 'major']
-        
-        return jsonify({
-            'success': True,
-            'key': {
-                'root': root,
-                'type': 'minor' if is_minor else 'major',
-                'position': key_data.get('position'),
-                'key_signature': key_data.get('key_signature', 0),
-            },
-            'relative_key': relative_key,
-            'diatonic_chords': chords,
-            'common_progressions': progressions,
-        })
+        root, _, _ = _canon_key(root)
+        body = _KEY_INFO_JSON.get(root)
+        if body is not None:
+            return Response(body, mimetype='application/json')
+        payload, status = _key_info(root)
+        return jsonify(payload), status
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
@@ -173,45 +274,14 @@ def get_key_info(root):
 def get_key_relationships(root):
     """Get relationships for a key (dominant, subdominant, relative)."""
     try:
-        root = root.title()
-        is_minor = root.endswith('m')
-        root_note = root[:-1] if is_minor else root
+        root, root_note, is_minor = _canon_key(root)
         
-        n = Note(root_note)
-        semitone = n.semitone
-        
-        if is_minor:
-            # For minor keys
-            relative_major = (semitone + 3) % 12  # Relative major is 3 semitones up
-            dominant = (semitone + 7) % 12  # Dominant is 7 semitones up
-            subdominant = (semitone + 5) % 12  # Subdominant is 5 semitones up
-            
-            return jsonify({
-                'success': True,
-                'key': root,
-                'type': 'minor',
-                'relationships': {
-                    'relative_major': Note.from_semitone(relative_major).name,
-                    'dominant': Note.from_semitone(dominant).name + 'm',
-                    'subdominant': Note.from_semitone(subdominant).name + 'm',
-                }
-            })
-        else:
-            # For major keys
-            relative_minor = (semitone - 3) % 12  # Relative minor is 3 semitones down
-            dominant = (semitone + 7) % 12  # Dominant is 7 semitones up (perfect 5th)
-            subdominant = (semitone + 5) % 12  # Subdominant is 5 semitones up (perfect 4th)
-            
-            return jsonify({
-                'success': True,
-                'key': root,
-                'type': 'major',
-                'relationships': {
-                    'relative_minor': Note.from_semitone(relative_minor).name + 'm',
-                    'dominant': Note.from_semitone(dominant).name,  # V chord
-                    'subdominant': Note.from_semitone(subdominant).name,  # IV chord
-                }
-            })
+        return jsonify({
+            'success': True,
+            'key': root,
+            'type': 'minor' if is_minor else 'major',
+            'relationships': (_MINOR_RELS if is_minor else _MAJOR_RELS)[_semitone(root_note)],
+        })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
@@ -220,19 +290,13 @@ def get_key_relationships(root):
 def get_neighbors(root):
     """Get neighboring keys on the circle of fifths."""
     try:
-        root = root.title()
-        is_minor = root.endswith('m')
-        root_note = root[:-1] if is_minor else root
+        root, root_note, is_minor = _canon_key(root)
         
         keys = MINOR_KEYS if is_minor else MAJOR_KEYS
+        by_root = MINOR_BY_ROOT if is_minor else MAJOR_BY_ROOT
         
         # Find position
-        position = None
-        for i, key in enumerate(keys):
-            key_root = key['root'].replace('m', '') if is_minor else key['root']
-            if key_root == root_note:
-                position = i
-                break
+        position, _ = by_root.get(root_note, (None, None))
         
         if position is None:
             return jsonify({'success': False, 'error': 'Key not found'}), 404
@@ -245,8 +309,8 @@ def get_neighbors(root):
             'success': True,
             'key': root,
             'neighbors': {
-                'counter_clockwise': keys[prev_pos]['root'],  # Subdominant side
-                'clockwise': keys[next_pos]['root'],  # Dominant side
+                'counter_clockwise': keys[prev_pos].root,  # Subdominant side
+                'clockwise': keys[next_pos].root,  # Dominant side
             }
         })
     except Exception as e:
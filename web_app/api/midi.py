@@ -1,17 +1,18 @@
 """MIDI API Blueprint
 REST API endpoints for MIDI import/export operations.
 """
-import sys
-import os
-import io
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import re
+from functools import lru_cache
 
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, Response, jsonify, request
 from music_engine.models import Scale, Chord
 
 bp = Blueprint('midi', __name__, url_prefix='/api/midi')
 
-def _get_midi_library():
+_UNSET = object()
+_MIDI_LIB = _UNSET
+
+def _probe_midi_library():
     try:
         import music21
         return 'music21'
@@ -23,42 +24,74 @@ def _get_midi_library():
     except ImportError:
         return None
 
+def _get_midi_library():
+    # The installed libraries don't change while the process runs: probe once
+    global _MIDI_LIB
+    if _MIDI_LIB is _UNSET:
+        _MIDI_LIB = _probe_midi_library()
+    return _MIDI_LIB
+
+# MThd chunk: length 6, format 0, 1 track, 480 ticks per quarter note
+_MIDI_HEADER = b'MThd' + (6).to_bytes(4, 'big') + (0).to_bytes(2, 'big') + (1).to_bytes(2, 'big') + (480).to_bytes(2, 'big')
+_TEMPO_EVENT = bytes([0x00, 0xFF, 0x51, 0x03])
+
+
+def _vlq(n):
+    """MIDI variable-length quantity: 7 bits per byte, high bit set on all but the last."""
+    out = [n & 0x7F]
+    n >>= 7
+    while n:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    return bytes(reversed(out))
+
+
+# Delta times: a note lasts an eighth (240 ticks) in sequence, a quarter
+# (480 ticks) when played together
+_EIGHTH = _vlq(240)
+_QUARTER = _vlq(480)
+_END_OF_TRACK = bytes([0x00, 0xFF, 0x2F, 0x00])
+_NOTE_RE = re.compile(r'^([A-G][#b]?)(\d)?$')
+_NOTE_MAP = {'C':60,'C#':61,'Db':61,'D':62,'D#':63,'Eb':63,'E':64,'F':65,'F#':66,'Gb':66,'G':67,'G#':68,'Ab':68,'A':69,'A#':70,'Bb':70,'B':71}
+
 def _create_midi_fallback(notes, tempo=120, simultaneous=False):
-    header = b'MThd'
-    header += (6).to_bytes(4, 'big')
-    header += (0).to_bytes(2, 'big')
-    header += (1).to_bytes(2, 'big')
-    header += (480).to_bytes(2, 'big')
-    track = b'MTrk'
-    track_data = bytearray()
     microseconds = int(60000000 / tempo)
-    track_data.extend([0x00, 0xFF, 0x51, 0x03])
-    track_data.extend(microseconds.to_bytes(3, 'big'))
-    note_map = {'C':60,'C#':61,'Db':61,'D':62,'D#':63,'Eb':63,'E':64,'F':65,'F#':66,'Gb':66,'G':67,'G#':68,'Ab':68,'A':69,'A#':70,'Bb':70,'B':71}
+    parts = [_TEMPO_EVENT, microseconds.to_bytes(3, 'big')]
+    note_map = _NOTE_MAP
     parsed = []
     for note in notes:
         if isinstance(note, str):
-            octave, note_name = 4, note
-            if len(note) > 1 and note[-1].isdigit():
-                note_name, octave = note[:-1], int(note[-1])
-            if note_name in note_map:
-                parsed.append(note_map[note_name] + (octave - 4) * 12)
-    time = 0
+            m = _NOTE_RE.match(note)
+            if not m:
+                continue
+            name, oct_s = m.groups()
+            midi = note_map.get(name)
+            if midi is not None:
+                parsed.append(midi + ((int(oct_s) if oct_s else 4) - 4) * 12)
     if simultaneous and parsed:
-        for midi in parsed: track_data.extend([0, 0x90, midi, 64])
-        time = 480
-        for midi in parsed: track_data.extend([time, 0x80, midi, 0]); time = 0
-    else:
+        parts.extend(bytes((0, 0x90, midi, 64)) for midi in parsed)
+        delta = _QUARTER
         for midi in parsed:
-            track_data.extend([time, 0x90, midi, 64]); time = 240
-            track_data.extend([time, 0x80, midi, 0]); time = 0
-    track_data.extend([0x00, 0xFF, 0x2F, 0x00])
-    track += len(track_data).to_bytes(4, 'big') + bytes(track_data)
-    return header + track
+            parts.append(delta + bytes((0x80, midi, 0)))
+            delta = b'\x00'
+    else:
+        # note-on at delta 0, note-off 240 ticks later
+        parts.extend(b''.join((bytes((0, 0x90, midi, 64)), _EIGHTH, bytes((0x80, midi, 0))))
+                     for midi in parsed)
+    parts.append(_END_OF_TRACK)
+    track_data = b''.join(parts)
+    return b''.join((_MIDI_HEADER, b'MTrk', len(track_data).to_bytes(4, 'big'), track_data))
+
+def _midi_response(midi_data, filename):
+    # midi_data is already bytes: no BytesIO/send_file copy needed
+    response = Response(midi_data, mimetype='audio/midi')
+    response.headers.set('Content-Disposition', 'attachment', filename=filename)
+    return response
 
 @bp.route('/status', methods=['GET'])
 def get_status():
-    return jsonify({'success': True, 'library': _get_midi_library(), 'available': _get_midi_library() is not None})
+    lib = _get_midi_library()
+    return jsonify({'success': True, 'library': lib, 'available': lib is not None})
 
 @bp.route('/export/scale', methods=['GET'])
 def export_scale_midi():
@@ -67,9 +100,9 @@ def export_scale_midi():
     octaves = int(request.args.get('octaves', 1))
     try:
         scale = Scale(root, scale_type, octaves)
-        note_names = [n.name + str(n.octave) for n in scale.notes]
+        note_names = [n.name for n in scale.notes]
         midi_data = _create_midi_fallback(note_names, tempo=120)
-        return send_file(io.BytesIO(midi_data), mimetype='audio/midi', as_attachment=True, download_name=root + '_' + scale_type + '_scale.mid')
+        return _midi_response(midi_data, root + '_' + scale_type + '_scale.mid')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
@@ -79,13 +112,20 @@ def export_chord_midi():
     quality = request.args.get('quality', 'maj')
     try:
         chord = Chord(root, quality)
-        note_names = [n.name + str(n.octave) for n in chord.notes]
+        note_names = [n.name for n in chord.notes]
         midi_data = _create_midi_fallback(note_names, tempo=120, simultaneous=True)
-        return send_file(io.BytesIO(midi_data), mimetype='audio/midi', as_attachment=True, download_name=root + '_' + quality + '_chord.mid')
+        return _midi_response(midi_data, root + '_' + quality + '_chord.mid')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+_NOTE_NAMES = ('C','C#','D','D#','E','F','F#','G','G#','A','A#','B')
+
+@lru_cache(maxsize=32)
+def _frequencies(octave):
+    # Shared between requests: read-only
+    return {n: round(440*2**(((octave+1)*12+i-69)/12),2) for i,n in enumerate(_NOTE_NAMES)}
+
 @bp.route('/frequencies', methods=['GET'])
 def get_frequencies():
     octave = int(request.args.get('octave', 4))
-    return jsonify({'success': True, 'octave': octave, 'frequencies': {n: round(440*2**(((octave+1)*12+i-69)/12),2) for i,n in enumerate(['C','C#','D','D#','E','F','F#','G','G#','A','A#','B'])}})
+    return jsonify({'success': True, 'octave': octave, 'frequencies': _frequencies(octave)})
@@ -5,10 +5,6 @@ API endpoints for the orchestrator module.
 Provides suggestions, expansions, and genre-specific rules.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from flask import Blueprint, jsonify, request
 from music_engine.orchestrator import (
     Coordinator, InputController, OutputFormatter,
@@ -17,12 +13,41 @@ from music_engine.orchestrator import (
     GenreDetector, JazzRules, PopRules, RockRules, BluesRules
 )
 from music_engine.models import Chord, Scale, Progression
+from music_engine.core.harmony import HarmonyEngine
+from .utils import parse_chord_symbol, precompress_json, static_json_response
 
 # Blueprint name
 BLUEPRINT_NAME = 'orchestrator'
 
 bp = Blueprint('orchestrator', __name__, url_prefix='/api/orchestrator')
 
+# The engine and the helpers built on it keep no per-request state, so one
+# instance of each is shared by every request
+_HARMONY = HarmonyEngine()
+_CHORD_SOLVER = ChordSolver(_HARMONY)
+_EXPANDER = ProgressionExpander(_HARMONY)
+_CONTINUATION = ContinuationGenerator(_HARMONY)
+_SUBSTITUTION = SubstitutionHandler(_HARMONY)
+
+# Genre name -> rules class
+_RULES_CLASSES = {
+    'jazz': JazzRules,
+    'pop': PopRules,
+    'rock': RockRules,
+    'blues': BluesRules,
+}
+
+# Genre rules are read-only tables: one instance per genre
+_GENRE_INSTANCES = {genre: rules_class() for genre, rules_class in _RULES_CLASSES.items()}
+_DEFAULT_RULES = _GENRE_INSTANCES['jazz']
+_GENRE_PROGRESSIONS = {genre: rules.common_progressions for genre, rules in _GENRE_INSTANCES.items()}
+
+# /genre/progressions for the known genres is static: serialize and compress it once
+_GENRE_PROGRESSIONS_BODIES = {
+    genre: precompress_json({'success': True, 'genre': genre, 'progressions': progressions})
+    for genre, progressions in _GENRE_PROGRESSIONS.items()
+}
+
 
 @bp.route('/suggest', methods=['POST'])
 def suggest():
@@ -37,7 +62,7 @@ def suggest():
     Returns:
         JSON with suggestions
     """
-    data = request.get_json() or {}
+    data = _request_data()
     
     input_str = data.get('input', '')
     genre = data.get('genre', 'jazz')
@@ -117,7 +142,7 @@ def expand():
     Returns:
         JSON with expanded progressions
     """
-    data = request.get_json() or {}
+    data = _request_data()
     
     chord_strings = data.get('chords', [])
     target_length = data.get('target_length', 8)
@@ -130,20 +155,7 @@ def expand():
     
     try:
         # Parse chords
-        chords = []
-        for cs in chord_strings:
-            root = cs.replace('maj7', '').replace('min7', 'm').replace('dom7', '7').replace('m7', 'm').replace('7', '').replace('maj', '').replace('min', 'm').replace('m', '')[:1]
-            quality = cs[len(root):] or 'maj'
-            
-            # Simplify quality
-            if quality == 'm':
-                quality = 'min'
-            
-            try:
-                chord = Chord(root, quality)
-                chords.append(chord)
-            except:
-                pass
+        chords = _parse_chords(chord_strings)
         
         if len(chords) < 2:
             return jsonify({
@@ -152,9 +164,7 @@ def expand():
             }), 400
         
         # Expand
-        from music_engine.core.harmony import HarmonyEngine
-        expander = ProgressionExpander(HarmonyEngine())
-        expansions = expander.expand(chords, target_length)
+        expansions = _EXPANDER.expand(chords, target_length)
         
         return jsonify({
             'success': True,
@@ -186,17 +196,10 @@ def next_chords():
     
     try:
         # Parse chord
-        root = chord_str.replace('maj7', '').replace('min7', 'm').replace('dom7', '7').replace('m7', 'm').replace('7', '').replace('maj', '').replace('min', 'm').replace('m', '')[:1]
-        quality = chord_str[len(root):] or 'maj'
-        
-        chord = Chord(root, quality)
+        chord = _parse_chord(chord_str)
         
         # Get suggestions
-        from music_engine.core.harmony import HarmonyEngine
-        harmony_engine = HarmonyEngine()
-        solver = ChordSolver(harmony_engine)
-        
-        next_chords = solver.suggest_next_chords(chord)
+        next_chords = _CHORD_SOLVER.suggest_next_chords(chord)
         
         # Apply genre filter
         genre_rules = get_genre_rules(genre)
@@ -232,15 +235,10 @@ def compatible_scales():
     
     try:
         # Parse chord
-        root = chord_str.replace('maj7', '').replace('min7', 'm').replace('dom7', '7').replace('m7', 'm').replace('7', '').replace('maj', '').replace('min', 'm').replace('m', '')[:1]
-        quality = chord_str[len(root):] or 'maj'
-        
-        chord = Chord(root, quality)
+        chord = _parse_chord(chord_str)
         
         # Get scales
-        from music_engine.core.harmony import HarmonyEngine
-        harmony_engine = HarmonyEngine()
-        compatible = harmony_engine.find_compatible_scales(chord)
+        compatible = _HARMONY.find_compatible_scales(chord)
         
         # Apply genre filter
         genre_rules = get_genre_rules(genre)
@@ -282,7 +280,7 @@ def detect_genre():
     Returns:
         JSON with detected genre
     """
-    data = request.get_json() or {}
+    data = _request_data()
     input_str = data.get('input', '')
     
     if not input_str:
@@ -321,13 +319,15 @@ def genre_progressions():
     """
     genre = request.args.get('genre', 'jazz')
     
+    bodies = _GENRE_PROGRESSIONS_BODIES.get(genre)
+    if bodies is not None:
+        return static_json_response(*bodies)
+    
     try:
-        genre_rules = get_genre_rules(genre)
-        
         return jsonify({
             'success': True,
             'genre': genre,
-            'progressions': genre_rules.common_progressions,
+            'progressions': _GENRE_PROGRESSIONS.get(genre, _GENRE_PROGRESSIONS['jazz']),
         })
         
     except Exception as e:
@@ -356,10 +356,7 @@ def tritone_substitute():
         
         chord = Chord(root, 'dom7')
         
-        from music_engine.core.harmony import HarmonyEngine
-        handler = SubstitutionHandler(HarmonyEngine())
-        
-        substitute = handler.get_tritone_substitute(chord)
+        substitute = _SUBSTITUTION.get_tritone_substitute(chord)
         
         if substitute:
             return jsonify({
@@ -393,7 +390,7 @@ def get_continuation():
     Returns:
         JSON with continuation options
     """
-    data = request.get_json() or {}
+    data = _request_data()
     
     chord_strings = data.get('chords', [])
     num_chords = data.get('num_chords', 4)
@@ -406,24 +403,10 @@ def get_continuation():
     
     try:
         # Parse chords
-        chords = []
-        for cs in chord_strings:
-            root = cs.replace('maj7', '').replace('min7', 'm').replace('dom7', '7').replace('m7', 'm').replace('7', '').replace('maj', '').replace('min', 'm').replace('m', '')[:1]
-            quality = cs[len(root):] or 'maj'
-            
-            if quality == 'm':
-                quality = 'min'
-            
-            try:
-                chord = Chord(root, quality)
-                chords.append(chord)
-            except:
-                pass
+        chords = _parse_chords(chord_strings)
         
         # Get continuations
-        from music_engine.core.harmony import HarmonyEngine
-        generator = ContinuationGenerator(HarmonyEngine())
-        continuations = generator.generate_continuations(chords, num_chords)
+        continuations = _CONTINUATION.generate_continuations(chords, num_chords)
         
         return jsonify({
             'success': True,
@@ -439,14 +422,39 @@ def get_continuation():
 
 
 # Helper functions
+def _request_data() -> dict:
+    """JSON body as a dict; {} when the body is empty, malformed or not an object."""
+    # No Content-Length shortcut: chunked bodies don't carry one
+    data = request.get_json(silent=True) or {}
+    return data if isinstance(data, dict) else {}
+
+
+def _parse_chord(chord_str: str) -> Chord:
+    """Parse a chord string like "Cmaj7", "F#m" or "Bb" into a Chord."""
+    args = parse_chord_symbol(chord_str)
+    if args is None:
+        raise ValueError(f'Invalid chord: {chord_str}')
+    return Chord(*args)
+
+
+def _parse_chords(chord_strings) -> list:
+    """Parse a list of chord strings, skipping the invalid ones."""
+    # Common case: every chord is valid, build them all in one pass
+    try:
+        return [_parse_chord(cs) for cs in chord_strings]
+    except Exception:
+        pass
+
+    chords = []
+    for cs in chord_strings:
+        try:
+            chords.append(_parse_chord(cs))
+        except Exception:
+            pass
+    return chords
+
+
 def get_genre_rules(genre: str):
-    """Get genre rules for a specific genre."""
-    rules_map = {
-        'jazz': JazzRules,
-        'pop': PopRules,
-        'rock': RockRules,
-        'blues': BluesRules,
-    }
-    
-    return rules_map.get(genre, JazzRules)()
+    """Get genre rules for a specific genre (shared instance, do not modify)."""
+    return _GENRE_INSTANCES.get(genre, _DEFAULT_RULES)
 
@@ -1,52 +1,71 @@
 """Progressions API Blueprint
 REST API endpoints for chord progression operations.
 """
-import sys
-import os
-import re
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functools import lru_cache
 
-from flask import Blueprint, jsonify, request
+import orjson
+from flask import Blueprint, Response, jsonify, request
+from music_engine.exceptions import MusicEngineError
 from music_engine.models import Progression, Chord
+from .utils import CACHE_LONG, INPUT_ERRORS, parse_chord_symbol
 
 bp = Blueprint('progressions', __name__, url_prefix='/api/progressions')
 
+# Strips the octave digits from a note name ('C4' -> 'C')
+_DIGITS_TT = str.maketrans('', '', '0123456789')
+
+# Static list returned by GET /api/progressions
+_PROGRESSIONS_BODY = orjson.dumps({
+    'success': True,
+    'progressions': [
+        {'id': 'i-iv-v-i', 'name': 'I-IV-V-I', 'chords': ['C', 'F', 'G', 'C']},
+        {'id': 'i-vi-iv-v', 'name': 'I-VI-IV-V', 'chords': ['C', 'Am', 'F', 'G']},
+        {'id': 'ii-v-i', 'name': 'ii-V-I', 'chords': ['Dm', 'G', 'C']},
+        {'id': 'i-iv-vi-v', 'name': 'I-IV-vi-V', 'chords': ['C', 'F', 'Am', 'G']},
+    ],
+})
+
+# Static list returned by GET /api/progressions/list
+_LIST_BODY = orjson.dumps({
+    'success': True,
+    'progressions': [
+        {'id': 'i-iv-v-i', 'name': 'I-IV-V-I'},
+        {'id': 'i-vi-iv-v', 'name': 'I-VI-IV-V'},
+        {'id': 'ii-v-i', 'name': 'ii-V-I'},
+    ],
+})
+
+
+@lru_cache(maxsize=1024)
+def _chord(root, quality):
+    """Chord for a root and quality, shared between requests (read-only)."""
+    return Chord(root, quality)
+
+
+def _clean_name(name):
+    """Chord name without the "Major"/"Minor" suffix, for cleaner display."""
+    return name[:-5] if name[-5:] in ('Major', 'Minor') else name
+
 
 @bp.route('', methods=['GET', 'POST'])
 def handle_progression():
     """Handle GET (list progressions) and POST (create progression) requests."""
     if request.method == 'GET':
         # Return list of available progressions
-        progressions = [
-            {'id': 'i-iv-v-i', 'name': 'I-IV-V-I', 'chords': ['C', 'F', 'G', 'C']},
-            {'id': 'i-vi-iv-v', 'name': 'I-VI-IV-V', 'chords': ['C', 'Am', 'F', 'G']},
-            {'id': 'ii-v-i', 'name': 'ii-V-I', 'chords': ['Dm', 'G', 'C']},
-            {'id': 'i-iv-vi-v', 'name': 'I-IV-vi-V', 'chords': ['C', 'F', 'Am', 'G']},
-        ]
-        return jsonify({'success': True, 'progressions': progressions})
+        return Response(_PROGRESSIONS_BODY, mimetype='application/json',
+                        headers={'Cache-Control': CACHE_LONG})
     
     # POST - create progression
     data = request.get_json()
     chord_strings = data.get('chords', [])
     
     try:
-        chords = []
-        for chord_str in chord_strings:
-            # Parse chord string like "Cmaj7", "Cmin", "F#m", "Bb"
-            # Format: root (letter + optional # or b) + quality
-            match = re.match(r'^([A-G][#b]?)(.*)$', chord_str)
-            if match:
-                root = match.group(1)
-                quality = match.group(2) if match.group(2) else 'maj'
-                # Normalize common quality names
-                if quality == 'm':
-                    quality = 'min'
-                elif quality in ['7', '9', '11', '13']:
-                    quality = f'dom{quality}'
-            else:
-                root = chord_str
-                quality = 'maj'
-            chords.append(Chord(root, quality))
+        # Parse all the strings first, then build the chords in one pass
+        parsed = [parse_chord_symbol(chord_str) for chord_str in chord_strings]
+        if None in parsed:
+            invalid = chord_strings[parsed.index(None)]
+            return jsonify({'success': False, 'error': f'Invalid chord: {invalid}'}), 400
+        chords = [_chord(root, quality) for root, quality in parsed]
         
         progression = Progression(chords)
         return jsonify({
@@ -56,18 +75,13 @@ def handle_progression():
                 'key': progression.key_name,
             }
         })
-    except Exception as e:
+    except INPUT_ERRORS as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
 
 @bp.route('/list', methods=['GET'])
 def list_progressions():
-    progressions = [
-        {'id': 'i-iv-v-i', 'name': 'I-IV-V-I'},
-        {'id': 'i-vi-iv-v', 'name': 'I-VI-IV-V'},
-        {'id': 'ii-v-i', 'name': 'ii-V-I'},
-    ]
-    return jsonify({'success': True, 'progressions': progressions})
+    return Response(_LIST_BODY, mimetype='application/json', headers={'Cache-Control': CACHE_LONG})
 
 
 @bp.route('/analyze', methods=['GET'])
@@ -107,42 +121,31 @@ def analyze_progression():
         # Build analysis result
         # Get key name without octave for cleaner display
         key_name = progression.key_name
-        if key_name and key_name.endswith(tuple(str(i) for i in range(10))):
+        if key_name:
             # Remove trailing numbers (octaves)
-            key_name = ''.join(c for c in key_name if not c.isdigit())
+            key_name = key_name.translate(_DIGITS_TT)
         
         # Get clean chord names (without "Major"/"Minor" suffix)
-        clean_chord_names = []
-        for c in progression.chords:
-            name = c.name
-            # Remove "Major" and "Minor" suffixes for cleaner display
-            if name.endswith('Major'):
-                name = name[:-5]
-            elif name.endswith('Minor'):
-                name = name[:-5]
-            clean_chord_names.append(name)
+        clean_chord_names = [_clean_name(c.name) for c in progression.chords]
         
         analysis = {
             'key': key_name if key_name else key or 'Unknown',
             'chords': clean_chord_names,
-            'all_notes': sorted(list(progression.all_note_names)),
+            'all_notes': sorted(progression.all_note_names),
             'complexity': progression.analysis.get('complexity', 'simple'),
             'num_chords': len(progression.chords),
         }
         
         # Add detected key if different from provided
         if progression.key and progression.key.name:
-            detected = progression.key.name
-            if detected.endswith(tuple(str(i) for i in range(10))):
-                detected = ''.join(c for c in detected if not c.isdigit())
-            analysis['detected_key'] = detected
+            analysis['detected_key'] = progression.key.name.translate(_DIGITS_TT)
         
         return jsonify({
             'success': True,
             'analysis': analysis
         })
         
-    except Exception as e:
+    except INPUT_ERRORS as e:
         return jsonify({
             'success': False,
             'error': str(e)
@@ -171,31 +174,15 @@ def get_roman_numerals():
         }), 400
     
     try:
-        # Parse chords
-        chords = _parse_chord_list(chord_strings)
+        result = _roman_analysis(key, tuple(chord_strings))
         
-        if not chords:
+        if result is None:
             return jsonify({
                 'success': False,
                 'error': 'Could not parse any valid chords'
             }), 400
         
-        # Create progression in the given key
-        progression = Progression(chords, key=key)
-        
-        # Get Roman numerals
-        roman_numerals = progression.to_roman_numerals()
-        
-        # Get clean chord names (without "Major"/"Minor" suffix)
-        clean_chord_names = []
-        for c in progression.chords:
-            name = c.name
-            if name.endswith('Major'):
-                name = name[:-5]
-            elif name.endswith('Minor'):
-                name = name[:-5]
-            clean_chord_names.append(name)
-        
+        clean_chord_names, roman_numerals = result
         return jsonify({
             'success': True,
             'key': key,
@@ -203,64 +190,51 @@ def get_roman_numerals():
             'roman_numerals': roman_numerals
         })
         
-    except Exception as e:
+    except INPUT_ERRORS as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 400
 
 
+@lru_cache(maxsize=4096)
+def _roman_analysis(key, chord_strings):
+    """(clean chord names, Roman numerals) of chords in a key, or None if no chord parses.
+
+    Cached: popular progressions in common keys are converted only once.
+    """
+    chords = _parse_chord_list(chord_strings)
+    if not chords:
+        return None
+    
+    # Create progression in the given key
+    progression = Progression(chords, key=key)
+    
+    # Get clean chord names (without "Major"/"Minor" suffix) and Roman numerals
+    clean_chord_names = tuple(_clean_name(c.name) for c in progression.chords)
+    return clean_chord_names, tuple(progression.to_roman_numerals())
+
+
+@lru_cache(maxsize=2048)
+def _parse_one(chord_str):
+    """Chord for one chord string, or None if it is not valid (cached)."""
+    args = parse_chord_symbol(chord_str)
+    if args is None:
+        return None
+    try:
+        return _chord(*args)
+    except (MusicEngineError, ValueError):
+        # Unknown root or quality; a TypeError here would be a bug, not bad input
+        return None
+
+
 def _parse_chord_list(chord_strings):
     """Parse a list of chord strings into Chord objects."""
+    # Handle common formats: C, Cmaj7, Cm, Cmin, C7, etc.
+    # Skip invalid chords but continue with valid ones
     chords = []
     for chord_str in chord_strings:
-        if not chord_str or not chord_str.strip():
-            continue
-            
-        try:
-            # Try to parse using Chord constructor
-            # Handle common formats: C, Cmaj7, Cm, Cmin, C7, etc.
-            chord_str = chord_str.strip()
-            
-            # Use regex to extract root and quality
-            match = re.match(r'^([A-G][#b]?)(.*)$', chord_str)
-            if match:
-                root = match.group(1)
-                quality = match.group(2) if match.group(2) else 'maj'
-                
-                # Normalize quality names
-                quality_map = {
-                    'maj7': 'maj7',
-                    'maj': 'maj',
-                    'm': 'min',
-                    'min': 'min',
-                    'm7': 'min7',
-                    'min7': 'min7',
-                    'dom7': 'dom7',
-                    '7': 'dom7',
-                    'dim': 'dim',
-                    'dim7': 'dim7',
-                    'aug': 'aug',
-                    'sus2': 'sus2',
-                    'sus4': 'sus4',
-                    '9': 'dom9',
-                    '11': 'dom11',
-                    '13': 'dom13',
-                }
-                
-                quality = quality_map.get(quality, quality)
-                if quality == 'maj' and root + 'maj' == chord_str:
-                    quality = 'maj7'
-                    
-                chord = Chord(root, quality)
-                chords.append(chord)
-            else:
-                # Try direct construction
-                chord = Chord(chord_str)
-                chords.append(chord)
-        except Exception as e:
-            # Skip invalid chords but continue with valid ones
-            continue
-    
+        chord = _parse_one(chord_str)
+        if chord is not None:
+            chords.append(chord)
     return chords
-
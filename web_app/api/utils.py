@@ -0,0 +1,67 @@
+"""
+Helpers shared by the API blueprints.
+"""
+
+import gzip
+
+import orjson
+from flask import Response, request
+from music_engine.exceptions import MusicEngineError
+
+# Cache-Control for API responses that are pure functions of the URL: the
+# output only changes with a deploy. No 'immutable', since the URLs aren't
+# versioned and clients must revalidate after a deploy
+CACHE_LONG = 'public, max-age=3600'
+
+# Errors caused by bad input (invalid note, unknown quality or scale type,
+# wrong JSON types): reported as 400, anything else is a server bug
+INPUT_ERRORS = (MusicEngineError, ValueError, KeyError, TypeError)
+
+# Chord string: root (letter + optional # or b) followed by the quality
+ROOT_LETTERS = frozenset('ABCDEFG')
+ACCIDENTALS = ('#', 'b')
+
+
+def split_root(chord_str):
+    """Split a chord string like "F#m7" into (root, quality text).
+
+    Surrounding whitespace is ignored; returns None if the string doesn't
+    start with a root note. Raises TypeError for anything but a string.
+    """
+    if not isinstance(chord_str, str):
+        raise TypeError(f'Chord must be a string, not {type(chord_str).__name__}')
+    chord_str = chord_str.strip()
+    if not chord_str or chord_str[0] not in ROOT_LETTERS:
+        return None
+    n = 2 if chord_str[1:2] in ACCIDENTALS else 1
+    return chord_str[:n], chord_str[n:]
+
+
+def parse_chord_symbol(chord_str):
+    """(root, quality) for a chord symbol like "F#m7", or None if it has no root.
+
+    A bare root is a major triad. Quality spellings ('m', '7', 'min7', ...)
+    are passed on as written: Chord normalizes them with its own alias
+    table, so every endpoint accepts the same symbols.
+    """
+    split = split_root(chord_str)
+    if split is None:
+        return None
+    root, quality = split
+    return root, quality or 'maj'
+
+
+def precompress_json(obj):
+    """Serialize a static response body once; returns (body, gzipped body)."""
+    body = orjson.dumps(obj)
+    return body, gzip.compress(body, compresslevel=9)
+
+
+def static_json_response(body, body_gz):
+    """Serve a precomputed JSON body, gzipped if the client accepts gzip."""
+    headers = {'Vary': 'Accept-Encoding'}
+    # accept_encodings honours q-values: "gzip;q=0" means the client refuses it
+    if request.accept_encodings['gzip']:
+        body = body_gz
+        headers['Content-Encoding'] = 'gzip'
+    return Response(body, mimetype='application/json', headers=headers)
@@ -1,32 +1,136 @@
+import gzip
+import hashlib
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs
 
 # Add project root directory to path for music_engine imports
-# This allows imports from both music_engine and web_app modules
-project_root = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, project_root)
+# This allows imports from both music_engine and web_app modules.
+# This is the only place that touches sys.path: the blueprints rely on it.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, _HERE)
 
 # Also add parent directory if music_engine is at the same level as web_app
-parent_dir = os.path.dirname(project_root)
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
+_ROOT = os.path.dirname(_HERE)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+import orjson
+try:
+    import brotli
+except ImportError:
+    brotli = None
+# htmlmin imports the cgi module, removed in Python 3.13: there (or if it isn't
+# installed) the pages are served unminified and _render_pages logs a warning
+try:
+    import htmlmin
+except ImportError:
+    htmlmin = None
+try:
+    from whitenoise import WhiteNoise
+except ImportError:
+    WhiteNoise = None
+from flask import Flask, Response, g, render_template, jsonify, request, url_for
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, used by jsonify() and request.get_json()."""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        # Types orjson can't encode natively (Decimal, ...) go through Flask's default
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
-from flask import Flask, render_template, jsonify, send_from_directory
-from flask_cors import CORS
-import music_engine
-from music_engine.core import scales, chords, harmony
-from music_engine.models import Scale, Chord, Progression
 
 app = Flask(__name__, template_folder="templates", static_folder="static")
-CORS(app)
+app.json = ORJSONProvider(app)
+# Browsers may reuse static assets for an hour (file names are not hashed)
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 3600
+# Optional CDN host (e.g. "cdn.example.com") pulling from this app's /static/
+app.config["CDN_DOMAIN"] = os.environ.get("CDN_DOMAIN", "")
+_STATIC_IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def _static_versions():
+    """Short content hash of every static file, keyed by its path under static/."""
+    versions = {}
+    for dirpath, _, filenames in os.walk(app.static_folder):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                digest = hashlib.md5(f.read()).hexdigest()[:12]
+            rel = os.path.relpath(path, app.static_folder).replace(os.sep, "/")
+            versions[rel] = digest
+    return versions
+
+
+# Built once: request paths never reach the filesystem through this table
+_STATIC_VERSIONS = _static_versions()
+
+
+@app.url_defaults
+def add_static_version(endpoint, values):
+    # Static URLs carry ?v=<content hash>, so a changed file gets a new URL
+    # and the old one can be cached forever
+    if endpoint == "static" and "v" not in values:
+        version = _STATIC_VERSIONS.get(values.get("filename", ""))
+        if version:
+            values["v"] = version
+
+
+def static_url_for(endpoint, **values):
+    """url_for() for templates: static assets point at the CDN when one is set."""
+    url = url_for(endpoint, **values)
+    if endpoint == "static" and app.config["CDN_DOMAIN"]:
+        url = f"https://{app.config['CDN_DOMAIN']}{url}"
+    return url
+
+
+app.jinja_env.globals["url_for"] = static_url_for
+
+# CORS: the API is public and takes no credentials, so every response gets the
+# same fixed headers and preflight requests are answered before routing
+_CORS_HEADERS = [
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Methods", "GET, POST, OPTIONS"),
+]
+_CORS_MAX_AGE = ("Access-Control-Max-Age", "86400")
+
+
+@app.before_request
+def answer_preflight():
+    if (
+        request.method == "OPTIONS"
+        and "Origin" in request.headers
+        and "Access-Control-Request-Method" in request.headers
+    ):
+        headers = [_CORS_MAX_AGE, ("Vary", "Access-Control-Request-Headers")]
+        # Allow whatever headers the client asks for, as Flask-CORS did
+        requested = request.headers.get("Access-Control-Request-Headers")
+        if requested:
+            headers.append(("Access-Control-Allow-Headers", requested))
+        return Response(status=204, headers=headers)
+    return None
+
+
+@app.after_request
+def add_cors_headers(response):
+    response.headers.extend(_CORS_HEADERS)
+    return response
 
 # Configure folders
-app.config["MUSIC_ENGINE_DIR"] = os.path.dirname(
-    os.path.dirname(os.path.abspath(__file__))
-)
-app.config["PRESETS_DIR"] = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "presets"
-)
+app.config["MUSIC_ENGINE_DIR"] = _ROOT
+app.config["PRESETS_DIR"] = os.path.join(_ROOT, "presets")
 
 # Import blueprints
 from api.scales import bp as scales_bp
@@ -37,6 +141,7 @@ from api.analyzer import bp as analyzer_bp
 from api.circle import bp as circle_bp
 from api.midi import bp as midi_bp
 from api.orchestrator import bp as orchestrator_bp
+from api.utils import CACHE_LONG
 
 # Register blueprints
 app.register_blueprint(scales_bp, url_prefix="/api/scales")
@@ -49,64 +154,178 @@ app.register_blueprint(midi_bp, url_prefix="/api/midi")
 app.register_blueprint(orchestrator_bp, url_prefix="/api/orchestrator")
 
 
-@app.route("/")
-def index():
-    return render_template("index.html")
-
-
-@app.route("/fretboard")
-def fretboard():
-    return render_template("fretboard.html")
-
-
-@app.route("/scales")
-def scales_page():
-    return render_template("scales.html")
-
-
-@app.route("/chords")
-def chords_page():
-    return render_template("chords.html")
-
-
-@app.route("/progressions")
-def progressions_page():
-    return render_template("progressions.html")
-
-
-@app.route("/analyzer")
-def analyzer():
-    return render_template("analyzer.html")
-
-
-@app.route("/learn")
-def learn():
-    return render_template("learn.html")
-
-
-@app.route("/privacy")
-def privacy():
-    return render_template("privacy.html")
-
-
-@app.route("/terms")
-def terms():
-    return render_template("terms.html")
-
-
-@app.route("/about")
-def about():
-    return render_template("about.html")
-
-
-@app.route("/realtime")
-def realtime():
-    return render_template("realtime.html")
-
-
-@app.route("/static/<path:filename>")
-def serve_static(filename):
-    return send_from_directory(app.static_folder, filename)
+# Static pages: URL -> (endpoint, template). The templates take no context and
+# only depend on the page URL (for the active nav link), so each one is rendered
+# once at startup and served from memory.
+_PAGE_ROUTES = {
+    "/": ("index", "index.html"),
+    "/fretboard": ("fretboard", "fretboard.html"),
+    "/scales": ("scales_page", "scales.html"),
+    "/chords": ("chords_page", "chords.html"),
+    "/progressions": ("progressions_page", "progressions.html"),
+    "/analyzer": ("analyzer", "analyzer.html"),
+    "/learn": ("learn", "learn.html"),
+    "/privacy": ("privacy", "privacy.html"),
+    "/terms": ("terms", "terms.html"),
+    "/about": ("about", "about.html"),
+    "/realtime": ("realtime", "realtime.html"),
+}
+
+
+# Content encodings the pages are precompressed with, in order of preference
+_PAGE_ENCODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def _render_pages():
+    """Render every static page: URL -> {encoding: (body, ETag)}.
+
+    The identity body is stored under None.
+    """
+    if htmlmin is None:
+        app.logger.warning(
+            "htmlmin is not available (it needs Python < 3.13): "
+            "serving the HTML pages unminified"
+        )
+    pages = {}
+    for path, (_, template) in _PAGE_ROUTES.items():
+        with app.test_request_context(path):
+            html = render_template(template)
+        if htmlmin is not None:
+            # Collapses whitespace and drops comments; <script>, <style> and
+            # <pre> contents are left as they are
+            html = htmlmin.minify(html, remove_comments=True)
+        body = html.encode("utf-8")
+        etag = hashlib.md5(body).hexdigest()
+        variants = {None: (body, etag)}
+        if brotli is not None:
+            variants["br"] = (brotli.compress(body, quality=11), etag + "-br")
+        variants["gzip"] = (gzip.compress(body, compresslevel=9), etag + "-gz")
+        pages[path] = variants
+    return pages
+
+
+def static_page():
+    variants = _STATIC_PAGES[request.path]
+    encoding = request.accept_encodings.best_match(_PAGE_ENCODINGS)
+    body, etag = variants[encoding]
+    response = Response(body, mimetype="text/html")
+    response.vary.add("Accept-Encoding")
+    if encoding is not None:
+        response.content_encoding = encoding
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+for _path, (_endpoint, _) in _PAGE_ROUTES.items():
+    app.add_url_rule(_path, _endpoint, static_page)
+
+_STATIC_PAGES = _render_pages()
+
+
+# API blueprints whose GET responses depend only on the URL (chords sets its
+# own ETags and caches its own payloads): add a validator so repeat requests
+# can get a 304, and keep recent responses in memory so a repeated URL skips
+# the view entirely
+_CACHEABLE_BLUEPRINTS = frozenset({"scales", "circle", "progressions"})
+_API_CACHE_CONTROL = CACHE_LONG
+
+# Cache plan resolved once from the URL map: endpoint -> Cache-Control
+_ENDPOINT_CACHE_CONTROL = {
+    rule.endpoint: _API_CACHE_CONTROL
+    for rule in app.url_map.iter_rules()
+    if "GET" in rule.methods
+    and rule.endpoint.partition(".")[0] in _CACHEABLE_BLUEPRINTS
+}
+
+# (URL, Accept-Encoding) -> (body, headers), least recently used first
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_SIZE = 1024
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _response_cache_key():
+    # circle serves gzip or identity bodies depending on Accept-Encoding
+    return request.full_path, request.headers.get("Accept-Encoding", "")
+
+
+@app.before_request
+def serve_cached_response():
+    if request.method != "GET" or request.endpoint not in _ENDPOINT_CACHE_CONTROL:
+        return None
+    key = _response_cache_key()
+    with _RESPONSE_CACHE_LOCK:
+        cached = _RESPONSE_CACHE.get(key)
+        if cached is None:
+            return None
+        _RESPONSE_CACHE.move_to_end(key)
+    g.response_cache_hit = True
+    body, headers = cached
+    return Response(body, headers=headers)
+
+
+@app.after_request
+def add_cache_validators(response):
+    cache_control = _ENDPOINT_CACHE_CONTROL.get(request.endpoint)
+    if (
+        cache_control is not None
+        and request.method == "GET"
+        and response.status_code == 200
+        and not response.direct_passthrough
+        and not response.is_streamed
+    ):
+        if "ETag" not in response.headers:
+            response.add_etag()
+        response.headers.setdefault("Cache-Control", cache_control)
+        if not g.get("response_cache_hit"):
+            entry = (response.get_data(), list(response.headers))
+            with _RESPONSE_CACHE_LOCK:
+                _RESPONSE_CACHE[_response_cache_key()] = entry
+                if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+                    _RESPONSE_CACHE.popitem(last=False)
+        response = response.make_conditional(request)
+    return response
+
+
+# Token bucket per client and endpoint for the API blueprints, so one client
+# can't tie up every worker: bursts of up to _RATE_LIMIT requests, refilled at
+# _RATE_LIMIT per minute. Hits in the response cache are answered by
+# serve_cached_response before this hook runs, so only requests that reach a
+# view (cache misses and POSTs) take a token
+_RATE_LIMITED_BLUEPRINTS = frozenset(
+    {"analysis", "analyzer", "chords", "midi", "orchestrator"}
+    | _CACHEABLE_BLUEPRINTS
+)
+_RATE_LIMIT = 120
+_RATE_PER_SECOND = _RATE_LIMIT / 60
+_MAX_BUCKETS = 10000
+
+# (client address, endpoint) -> (tokens left, time of last update), least
+# recently seen first: past _MAX_BUCKETS the oldest bucket is dropped
+_BUCKETS = OrderedDict()
+_BUCKETS_LOCK = threading.Lock()
+
+
+@app.before_request
+def rate_limit():
+    if request.method == "OPTIONS" or request.blueprint not in _RATE_LIMITED_BLUEPRINTS:
+        return None
+    key = (request.remote_addr, request.endpoint)
+    now = time.monotonic()
+    with _BUCKETS_LOCK:
+        tokens, last = _BUCKETS.get(key, (_RATE_LIMIT, now))
+        tokens = min(_RATE_LIMIT, tokens + (now - last) * _RATE_PER_SECOND)
+        allowed = tokens >= 1
+        _BUCKETS[key] = (tokens - 1 if allowed else tokens, now)
+        _BUCKETS.move_to_end(key)
+        if len(_BUCKETS) > _MAX_BUCKETS:
+            _BUCKETS.popitem(last=False)
+    if allowed:
+        return None
+    retry_after = int((1 - tokens) / _RATE_PER_SECOND) + 1
+    response = jsonify({"success": False, "error": "Too many requests"})
+    response.status_code = 429
+    response.headers["Retry-After"] = str(retry_after)
+    return response
 
 
 @app.route("/health")
@@ -126,6 +345,59 @@ def server_error(e):
     ), 500
 
 
+# Behind a reverse proxy (e.g. Render's load balancer) the client address is in
+# X-Forwarded-For: trust that many proxy hops so per-client limits see it. Only
+# set it when such a proxy is really in front: otherwise clients can spoof the
+# header and get a fresh rate-limit bucket per request
+_TRUSTED_PROXY_COUNT = int(os.environ.get("TRUSTED_PROXY_COUNT", 0))
+if _TRUSTED_PROXY_COUNT:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=_TRUSTED_PROXY_COUNT)
+
+
+# When WhiteNoise is installed (production), it serves /static/ in front of
+# Flask, so asset requests never reach a view. Otherwise Flask's own static
+# route serves them.
+if WhiteNoise is not None:
+    app.wsgi_app = WhiteNoise(
+        app.wsgi_app, root=app.static_folder, prefix="static/", max_age=3600,
+        # Re-scan files on each request while developing
+        autorefresh=bool(os.environ.get("FLASK_DEBUG")),
+    )
+
+
+class ImmutableStaticAssets:
+    """WSGI middleware: a static URL whose ?v= matches the file's hash is cached for good.
+
+    It wraps whichever of WhiteNoise or Flask serves /static/ (WhiteNoise
+    ignores the query string), so versioned URLs get the same headers in
+    production and in development.
+    """
+
+    def __init__(self, wsgi_app, prefix, versions):
+        self.wsgi_app = wsgi_app
+        self.prefix = prefix
+        self.versions = versions
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path.startswith(self.prefix):
+            version = parse_qs(environ.get("QUERY_STRING", "")).get("v", [None])[0]
+            expected = self.versions.get(path[len(self.prefix):])
+            if version is not None and version == expected:
+                def start_immutable(status, headers, exc_info=None):
+                    if status.startswith(("200", "304")):
+                        headers = [(k, v) for k, v in headers if k.lower() != "cache-control"]
+                        headers.append(("Cache-Control", _STATIC_IMMUTABLE))
+                    return start_response(status, headers, exc_info)
+                return self.wsgi_app(environ, start_immutable)
+        return self.wsgi_app(environ, start_response)
+
+
+app.wsgi_app = ImmutableStaticAssets(
+    app.wsgi_app, app.static_url_path + "/", _STATIC_VERSIONS
+)
+
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port, debug=False)
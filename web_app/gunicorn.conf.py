@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for the web app.
+
+    gunicorn -c web_app/gunicorn.conf.py wsgi:app
+"""
+import os
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+
+# CPU-bound handlers: a few threads per worker process. Raise GUNICORN_THREADS
+# to overlap more slow clients per worker without forking more processes.
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Import the app (and warm its caches) once, before forking the workers
+preload_app = True
+
+# SO_REUSEPORT on the listening socket, so a new master can bind the port
+# while the old one drains during a restart. Gunicorn already sets
+# TCP_NODELAY on TCP listeners.
+reuse_port = True
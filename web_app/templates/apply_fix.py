@@ -1,5 +1,10 @@
+import os
+import tempfile
+
+PATH = 'web_app/templates/chords.html'
+
 # Leggi il file
-with open('web_app/templates/chords.html', 'r', encoding='utf-8') as f:
+with open(PATH, 'r', encoding='utf-8') as f:
     content = f.read()
 
 # Trova e sostituisci la funzione vuota
@@ -67,10 +72,17 @@ new_code = '''async function mostraAccordo(root, quality) {
 }'''
 
 # Applica la sostituzione
-if old_code in content:
+if new_code in content:
+    # Già applicato: niente da riscrivere
+    print("Fix già applicato")
+elif old_code in content:
     content = content.replace(old_code, new_code)
-    with open('web_app/templates/chords.html', 'w', encoding='utf-8') as f:
+    # Scrivi su un file temporaneo e sostituisci: mai un chords.html scritto a metà
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(PATH), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
         f.write(content)
+    os.chmod(tmp, os.stat(PATH).st_mode)
+    os.replace(tmp, PATH)
     print("Fix applicato!")
 else:
     print("Codice non trovato")